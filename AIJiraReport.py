@@ -13,14 +13,8 @@ from jira.exceptions import JIRAError
 from atlassian import Confluence
 from atlassian.errors import ApiError
 
-# Configuration
-config_list = [
-    {
-        "model": "qwen2.5",  # or any model you have in Ollama
-        "base_url": "http://localhost:11434/v1",
-        "api_key": "ollama",  # Ollama doesn't need a real key
-    }
-]
+from modelClients import legacy_llm_config
+from toolRegistry import ToolRegistry
 
 # JIRA Configuration
 JIRA_CONFIG = {
@@ -1006,21 +1000,39 @@ class ConfluenceTools:
         return html
 
 
-# Initialize tools
-jira_tools = JIRATools(
+class _LazyClient:
+    """Builds the wrapped client on first use, so importing this module doesn't connect"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+
+    def __getattr__(self, name):
+        if self._client is None:
+            self._client = self._factory()
+        return getattr(self._client, name)
+
+
+# Initialize tools (JIRA/Confluence connect on the first tool call)
+jira_tools = _LazyClient(lambda: JIRATools(
     server=JIRA_CONFIG["server"],
     email=JIRA_CONFIG["email"],
     api_token=JIRA_CONFIG["api_token"]
-)
+))
 
-confluence_tools = ConfluenceTools(
+confluence_tools = _LazyClient(lambda: ConfluenceTools(
     url=CONFLUENCE_CONFIG["url"],
     username=CONFLUENCE_CONFIG["username"],
     password=CONFLUENCE_CONFIG["password"]
-)
+))
+
+
+# Tools exposed to the assistant; registered via the decorators below
+agent_tools = ToolRegistry()
 
 
 # JIRA function wrappers
+@agent_tools.tool(description="Create a new JIRA issue")
 def create_jira_issue(project_key: str, summary: str, description: str,
                       issue_type: str = "Task") -> str:
     """Create a new JIRA issue"""
@@ -1028,18 +1040,21 @@ def create_jira_issue(project_key: str, summary: str, description: str,
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Get JIRA issue details")
 def get_jira_issue(issue_key: str) -> str:
     """Get JIRA issue details"""
     result = jira_tools.get_issue(issue_key)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Search JIRA issues using JQL")
 def search_jira_issues(jql: str, max_results: int = 50) -> str:
     """Search JIRA issues using JQL"""
     result = jira_tools.search_issues(jql, max_results)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Update a JIRA issue")
 def update_jira_issue(issue_key: str, summary: str = None,
                       description: str = None) -> str:
     """Update a JIRA issue"""
@@ -1052,30 +1067,35 @@ def update_jira_issue(issue_key: str, summary: str = None,
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Add a comment to a JIRA issue")
 def add_jira_comment(issue_key: str, comment: str) -> str:
     """Add a comment to a JIRA issue"""
     result = jira_tools.add_comment(issue_key, comment)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Transition a JIRA issue")
 def transition_jira_issue(issue_key: str, transition_name: str) -> str:
     """Transition a JIRA issue"""
     result = jira_tools.transition_issue(issue_key, transition_name)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Assign a JIRA issue to a user")
 def assign_jira_issue(issue_key: str, assignee: str) -> str:
     """Assign a JIRA issue to a user"""
     result = jira_tools.assign_issue(issue_key, assignee)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Get list of assignable users")
 def get_assignable_users(project_key: str = None, issue_key: str = None) -> str:
     """Get list of assignable users"""
     result = jira_tools.get_assignable_users(project_key, issue_key)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Get list of JIRA boards")
 def get_jira_boards(project_key: str = None) -> str:
     """Get list of JIRA boards, optionally filtered by project
 
@@ -1087,6 +1107,7 @@ def get_jira_boards(project_key: str = None) -> str:
 
 
 # Report function wrappers
+@agent_tools.tool(description="Generate comprehensive sprint report with metrics and analysis")
 def generate_sprint_report(board_id: int, sprint_id: int = None) -> str:
     """Generate comprehensive sprint report
 
@@ -1098,6 +1119,7 @@ def generate_sprint_report(board_id: int, sprint_id: int = None) -> str:
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Generate overall project summary with status distribution")
 def generate_project_summary(project_key: str) -> str:
     """Generate overall project summary report
 
@@ -1108,6 +1130,7 @@ def generate_project_summary(project_key: str) -> str:
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Generate workload report showing current assignments")
 def generate_user_workload_report(project_key: str = None) -> str:
     """Generate workload report by user
 
@@ -1118,6 +1141,7 @@ def generate_user_workload_report(project_key: str = None) -> str:
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Generate velocity report for recent sprints")
 def generate_velocity_report(board_id: int, num_sprints: int = 5) -> str:
     """Generate velocity report for recent sprints
 
@@ -1129,6 +1153,7 @@ def generate_velocity_report(board_id: int, num_sprints: int = 5) -> str:
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Generate report of aging/stale issues")
 def generate_issue_aging_report(project_key: str, days_threshold: int = 30) -> str:
     """Generate report of aging issues
 
@@ -1140,6 +1165,7 @@ def generate_issue_aging_report(project_key: str, days_threshold: int = 30) -> s
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Generate comprehensive bug analysis report")
 def generate_bug_report(project_key: str) -> str:
     """Generate comprehensive bug report
 
@@ -1150,6 +1176,7 @@ def generate_bug_report(project_key: str) -> str:
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Generate custom report using JQL query")
 def generate_custom_report(jql: str, report_name: str = "Custom Report") -> str:
     """Generate a custom report based on JQL query
 
@@ -1162,6 +1189,7 @@ def generate_custom_report(jql: str, report_name: str = "Custom Report") -> str:
 
 
 # Confluence function wrappers
+@agent_tools.tool(description="Create a new Confluence page")
 def create_confluence_page(space_key: str, title: str, body: str,
                            parent_id: str = None) -> str:
     """Create a new Confluence page"""
@@ -1169,6 +1197,7 @@ def create_confluence_page(space_key: str, title: str, body: str,
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Get Confluence page details")
 def get_confluence_page(page_id: str = None, title: str = None,
                         space_key: str = None) -> str:
     """Get a Confluence page"""
@@ -1176,36 +1205,42 @@ def get_confluence_page(page_id: str = None, title: str = None,
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Update a Confluence page")
 def update_confluence_page(page_id: str, title: str = None, body: str = None) -> str:
     """Update a Confluence page"""
     result = confluence_tools.update_page(page_id, title, body)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Delete a Confluence page")
 def delete_confluence_page(page_id: str) -> str:
     """Delete a Confluence page"""
     result = confluence_tools.delete_page(page_id)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Get list of Confluence spaces")
 def get_confluence_spaces(limit: int = 25) -> str:
     """Get list of Confluence spaces"""
     result = confluence_tools.get_spaces(limit)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Search Confluence pages")
 def search_confluence_pages(cql: str, limit: int = 25) -> str:
     """Search Confluence pages using CQL"""
     result = confluence_tools.search_pages(cql, limit)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Link JIRA issue to Confluence page")
 def link_jira_to_confluence(page_id: str, issue_key: str) -> str:
     """Link a JIRA issue to a Confluence page"""
     result = confluence_tools.link_jira_issue_to_page(page_id, issue_key)
     return json.dumps(result, indent=2)
 
 
+@agent_tools.tool(description="Create formatted Confluence page from JIRA report")
 def create_report_in_confluence(space_key: str, title: str, report_json: str) -> str:
     """Create a Confluence page from a JIRA report
 
@@ -1223,11 +1258,7 @@ def create_report_in_confluence(space_key: str, title: str, report_json: str) ->
 
 
 # LLM Configuration
-llm_config = {
-    "config_list": config_list,
-    "timeout": 120,
-    "temperature": 0.7,
-}
+llm_config = legacy_llm_config("qwen2.5", temperature=0.7, timeout=120)  # or any model you have in Ollama
 
 # Create assistant agent
 assistant = autogen.AssistantAgent(
@@ -1279,72 +1310,11 @@ user_proxy = autogen.UserProxyAgent(
     human_input_mode="TERMINATE",
     max_consecutive_auto_reply=10,
     code_execution_config=False,
-    function_map={
-        # Basic JIRA operations
-        "create_jira_issue": create_jira_issue,
-        "get_jira_issue": get_jira_issue,
-        "search_jira_issues": search_jira_issues,
-        "update_jira_issue": update_jira_issue,
-        "add_jira_comment": add_jira_comment,
-        "transition_jira_issue": transition_jira_issue,
-        "assign_jira_issue": assign_jira_issue,
-        "get_assignable_users": get_assignable_users,
-        "get_jira_boards": get_jira_boards,
-        # Report functions
-        "generate_sprint_report": generate_sprint_report,
-        "generate_project_summary": generate_project_summary,
-        "generate_user_workload_report": generate_user_workload_report,
-        "generate_velocity_report": generate_velocity_report,
-        "generate_issue_aging_report": generate_issue_aging_report,
-        "generate_bug_report": generate_bug_report,
-        "generate_custom_report": generate_custom_report,
-        # Confluence operations
-        "create_confluence_page": create_confluence_page,
-        "get_confluence_page": get_confluence_page,
-        "update_confluence_page": update_confluence_page,
-        "delete_confluence_page": delete_confluence_page,
-        "get_confluence_spaces": get_confluence_spaces,
-        "search_confluence_pages": search_confluence_pages,
-        "link_jira_to_confluence": link_jira_to_confluence,
-        "create_report_in_confluence": create_report_in_confluence,
-    }
+    function_map=agent_tools.function_map(),
 )
 
-# Register all functions
-functions_to_register = [
-    (create_jira_issue, "Create a new JIRA issue"),
-    (get_jira_issue, "Get JIRA issue details"),
-    (search_jira_issues, "Search JIRA issues using JQL"),
-    (update_jira_issue, "Update a JIRA issue"),
-    (add_jira_comment, "Add a comment to a JIRA issue"),
-    (transition_jira_issue, "Transition a JIRA issue"),
-    (assign_jira_issue, "Assign a JIRA issue to a user"),
-    (get_assignable_users, "Get list of assignable users"),
-    (get_jira_boards, "Get list of JIRA boards"),
-    (generate_sprint_report, "Generate comprehensive sprint report with metrics and analysis"),
-    (generate_project_summary, "Generate overall project summary with status distribution"),
-    (generate_user_workload_report, "Generate workload report showing current assignments"),
-    (generate_velocity_report, "Generate velocity report for recent sprints"),
-    (generate_issue_aging_report, "Generate report of aging/stale issues"),
-    (generate_bug_report, "Generate comprehensive bug analysis report"),
-    (generate_custom_report, "Generate custom report using JQL query"),
-    (create_confluence_page, "Create a new Confluence page"),
-    (get_confluence_page, "Get Confluence page details"),
-    (update_confluence_page, "Update a Confluence page"),
-    (delete_confluence_page, "Delete a Confluence page"),
-    (get_confluence_spaces, "Get list of Confluence spaces"),
-    (search_confluence_pages, "Search Confluence pages"),
-    (link_jira_to_confluence, "Link JIRA issue to Confluence page"),
-    (create_report_in_confluence, "Create formatted Confluence page from JIRA report"),
-]
-
-for func, description in functions_to_register:
-    autogen.register_function(
-        func,
-        caller=assistant,
-        executor=user_proxy,
-        description=description
-    )
+# Register all tools with the assistant (schemas) and user proxy (execution)
+agent_tools.register_autogen(caller=assistant, executor=user_proxy)
 
 
 def main():
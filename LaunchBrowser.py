@@ -4,23 +4,60 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import json
 import time
+from typing import List
+
+from actionProtocol import ActionFailed, ActionParser, IncrementalJSONParser, action_schema, plan_steps
+from driverPool import WebDriverPool
+from pageReady import ACTION_TIMEOUTS, install_tracker, wait_for_page_ready
+from pageText import extract_page_text
+from screenshotWorker import ScreenshotWorker
+from sessionManager import BrowserSessionManager, format_results
+from toolRegistry import ToolArgumentError, ToolRegistry
+
+# Actions the model can ask for; schemas and descriptions are derived once
+browser_actions = ToolRegistry()
 
 
 class OllamaAIBrowserAgent:
-    def __init__(self, model="llama2"):
+    def __init__(self, model="llama2", structured_output=True):
         self.model = model
+        # Ask Ollama for schema-constrained JSON; turned off if the server can't do it
+        self.structured_output = structured_output
+        self.action_format = action_schema(browser_actions.names)
+        self.action_parser = ActionParser()
+        # Model calls vs. actions executed, to track actions per LLM turn
+        self.llm_calls = 0
+        self.actions_run = 0
+        # Cap on parallel browser sessions for the parallel/search_many actions
+        self.max_sessions = 3
+        self._in_session = False
         self.driver = None
+        self.pool = None
+        # Headless pool for parallel sessions when the agent wasn't given one; closed with the browser
+        self.session_pool = None
         self.conversation_history = []
-
-    def launch_browser(self):
-        """Launch Chrome browser"""
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()
+        # Latest user request, used to rank page text by relevance
+        self.current_request = ""
+        # Continuation offset for more_text (None when nothing is left) and the
+        # query its ranking was built for; later turns change current_request
+        self.text_offset = None
+        self.text_query = ""
+        self.screenshots = ScreenshotWorker()
+
+    def launch_browser(self, pool=None):
+        """Launch Chrome browser, or check one out of a WebDriverPool"""
+        if pool is not None:
+            self.pool = pool
+            self.driver = pool.acquire()
+        else:
+            self.driver = webdriver.Chrome()
+            self.driver.maximize_window()
+        install_tracker(self.driver)
         print("Browser launched successfully!")
         return self.driver
 
+    @browser_actions.tool("page_info", description="Get current page info")
     def get_page_info(self):
         """Get current page information"""
         try:
@@ -28,67 +65,178 @@ class OllamaAIBrowserAgent:
             url = self.driver.current_url
             return f"Current page: {title}\nURL: {url}"
         except:
-            return "No page loaded"
+            raise ActionFailed("No page loaded")
 
-    def navigate_to_url(self, url):
+    @browser_actions.tool("navigate", description="Go to a URL")
+    def navigate_to_url(self, url: str):
         """Navigate to a specific URL"""
         if not url.startswith('http'):
             url = 'https://' + url
         self.driver.get(url)
-        time.sleep(2)
+        wait_for_page_ready(self.driver, "navigate")
         return f"Navigated to {url}"
 
-    def search_google(self, query):
+    @browser_actions.tool("search", description="Search Amazon")
+    def search_google(self, query: str):
         """Perform Google search"""
         self.driver.get("https://www.amazon.in/")
-        time.sleep(1)
         try:
-            search_box = self.driver.find_element(By.NAME, "q")
+            search_box = WebDriverWait(self.driver, ACTION_TIMEOUTS["search"]).until(
+                EC.presence_of_element_located((By.NAME, "q"))
+            )
             search_box.send_keys(query)
             search_box.send_keys(Keys.RETURN)
-            time.sleep(2)
+            wait_for_page_ready(self.driver, "search")
             return f"Searched Google for: {query}"
         except Exception as e:
-            return f"Search failed: {str(e)}"
+            raise ActionFailed(f"Search failed: {str(e)}")
 
-    def click_element(self, text):
+    @browser_actions.tool("click", description="Click an element by its link text")
+    def click_element(self, text: str):
         """Click an element containing specific text"""
         try:
-            element = self.driver.find_element(By.PARTIAL_LINK_TEXT, text)
+            element = WebDriverWait(self.driver, ACTION_TIMEOUTS["click"]).until(
+                EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, text))
+            )
             element.click()
-            time.sleep(2)
+            wait_for_page_ready(self.driver, "click")
             return f"Clicked on: {text}"
         except:
-            return f"Could not find element with text: {text}"
+            raise ActionFailed(f"Could not find element with text: {text}")
 
-    def get_page_text(self):
-        """Get visible text from current page"""
+    @browser_actions.tool("get_text", description="Get the page text most relevant to the request")
+    def get_page_text(self, max_tokens: int = 400):
+        """Get the visible page text most relevant to the current request"""
         try:
-            body = self.driver.find_element(By.TAG_NAME, "body")
-            text = body.text[:1000]  # Limit to first 1000 characters
-            return text
+            result = extract_page_text(self.driver, self.current_request, max_tokens)
+            self.text_query = self.current_request
+            self.text_offset = result["next"]
+            return self._format_text_chunk(result)
         except:
-            return "Could not retrieve page text"
+            raise ActionFailed("Could not retrieve page text")
 
-    def take_screenshot(self, filename="screenshot.png"):
-        """Take screenshot of current page"""
-        self.driver.save_screenshot(filename)
-        return f"Screenshot saved as {filename}"
+    @browser_actions.tool("more_text", description="Get the next chunk of page text")
+    def get_more_text(self, max_tokens: int = 400):
+        """Continue reading page text from where get_page_text stopped"""
+        if self.text_offset is None:
+            return "No more page text"
+        try:
+            result = extract_page_text(self.driver, self.text_query, max_tokens, self.text_offset)
+            self.text_offset = result["next"]
+            return self._format_text_chunk(result)
+        except:
+            raise ActionFailed("Could not retrieve page text")
+
+    def _format_text_chunk(self, result):
+        text = result["text"]
+        if result["next"] is not None:
+            remaining = result["total"] - result["next"]
+            text += f"\n[{remaining} more text blocks available: use more_text]"
+        return text
+
+    @browser_actions.tool("screenshot", description="Take a screenshot")
+    def take_screenshot(self, filename: str = "screenshot.jpg", element_text: str = None,
+                        full_page: bool = False):
+        """Take screenshot of the viewport, the full page or one element
+
+        Encoding and saving happen in the background; this returns as soon
+        as the frame has been captured.
+
+        Args:
+            filename: Output file; .jpg, .webp or .png
+            element_text: Crop to the link containing this text
+            full_page: Capture the whole page instead of the viewport
+        """
+        try:
+            element = None
+            if element_text:
+                element = self.driver.find_element(By.PARTIAL_LINK_TEXT, element_text)
+            self.screenshots.capture(self.driver, filename, element=element, full_page=full_page)
+            return f"Screenshot queued as {filename}"
+        except Exception as e:
+            raise ActionFailed(f"Screenshot failed: {str(e)}")
+
+    def _session_worker(self, driver):
+        """Agent bound to a pooled driver, used to run one parallel session"""
+        worker = OllamaAIBrowserAgent(model=self.model, structured_output=self.structured_output)
+        worker.driver = driver
+        worker.current_request = self.current_request
+        worker._in_session = True
+        # Queue screenshots on this agent's worker, so close_browser flushes them and reports errors
+        worker.screenshots.close()
+        worker.screenshots = self.screenshots
+        install_tracker(driver)
+        return worker
+
+    @browser_actions.tool("parallel", description="Run several independent plans at once, each in its own browser session")
+    def run_parallel(self, plans: List[list]):
+        """Run plans concurrently and merge their observations
+
+        Args:
+            plans: List of plans; each plan is a list of {"action", "parameters"} steps
+        """
+        if self._in_session:
+            raise ActionFailed("parallel cannot be nested inside a parallel session")
+        steps = [plan_steps({"plan": plan}) for plan in plans]
+        pool = self.pool
+        if pool is None:
+            if self.session_pool is None:
+                self.session_pool = WebDriverPool(size=self.max_sessions)
+            pool = self.session_pool
+        manager = BrowserSessionManager(self._session_worker, pool=pool,
+                                        max_concurrency=self.max_sessions)
+        results = manager.run_sync(steps)
+        self.actions_run += sum(len(plan) for plan in steps)
+        return format_results(results)
+
+    @browser_actions.tool("search_many", description="Search Amazon for several queries in parallel and read each result page")
+    def search_many(self, queries: List[str]):
+        """Compare several searches side by side
+
+        Args:
+            queries: Search queries, one browser session each
+        """
+        plans = [
+            [{"action": "search", "parameters": {"query": q}},
+             {"action": "get_text", "parameters": {}}]
+            for q in queries
+        ]
+        return self.run_parallel(plans)
+
+    def _run_step(self, action_type, params):
+        """Run one action, returning (succeeded, result text)"""
+        if action_type not in browser_actions:
+            return False, "Unknown action"
+        try:
+            return True, browser_actions.dispatch(action_type, params, instance=self)
+        except ToolArgumentError as e:
+            return False, f"Invalid parameters: {e}"
+        except ActionFailed as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"{action_type} failed: {str(e)}"
 
     def execute_action(self, action_type, **kwargs):
         """Execute browser actions based on AI decision"""
-        actions = {
-            "navigate": lambda: self.navigate_to_url(kwargs.get('url', '')),
-            "search": lambda: self.search_google(kwargs.get('query', '')),
-            "click": lambda: self.click_element(kwargs.get('text', '')),
-            "screenshot": lambda: self.take_screenshot(kwargs.get('filename', 'screenshot.png')),
-            "get_text": lambda: self.get_page_text(),
-            "page_info": lambda: self.get_page_info()
-        }
-
-        if action_type in actions:
-            return actions[action_type]()
-        return "Unknown action"
+        return self._run_step(action_type, kwargs)[1]
+
+    def run_plan(self, steps):
+        """Run a list of actions back to back, stopping at the first failure
+
+        Returns one consolidated observation covering every step.
+        """
+        lines = []
+        for i, step in enumerate(steps, 1):
+            print(f"⚡ Executing step {i}/{len(steps)}: {step['action']} {step['parameters']}")
+            ok, result = self._run_step(step["action"], step["parameters"])
+            self.actions_run += 1
+            lines.append(f"{i}. {step['action']}: {'✅' if ok else '❌'} {result}")
+            if not ok:
+                skipped = len(steps) - i
+                if skipped:
+                    lines.append(f"Stopped after failure; {skipped} remaining step(s) skipped.")
+                break
+        return "\n".join(lines)
 
     def ask_ollama(self, user_message):
         """Send message to Ollama and get response"""
@@ -99,25 +247,33 @@ class OllamaAIBrowserAgent:
 
         # System prompt to guide the AI
         system_prompt = """You are a browser automation assistant. You can control a web browser.
-Available actions:
-- navigate: Go to a URL (provide 'url')
-- search: Search Amazon (provide 'query')
-- click: Click an element (provide 'text')
-- screenshot: Take a screenshot (provide 'filename')
-- get_text: Get page text
-- page_info: Get current page info
+Available actions (args marked ? are optional):
+""" + browser_actions.describe() + """
 
-Respond with JSON format: {"action": "action_type", "parameters": {...}, "explanation": "why"}
-If just chatting, respond normally without JSON."""
+Respond with JSON containing an ordered plan of ALL the actions needed for the request:
+{"plan": [{"action": "action_type", "parameters": {...}}, ...], "explanation": "why"}
+Steps run in order and stop at the first failure.
+If just chatting, use {"plan": [], "explanation": "why", "message": "your answer"}."""
 
         messages = [{"role": "system", "content": system_prompt}] + self.conversation_history
 
-        response = ollama.chat(
-            model=self.model,
-            messages=messages
-        )
+        self.llm_calls += 1
+        ai_response = None
+        if self.structured_output:
+            try:
+                response = ollama.chat(
+                    model=self.model,
+                    messages=messages,
+                    format=self.action_format
+                )
+                ai_response = response['message']['content']
+            except ollama.ResponseError as e:
+                # Server or model without JSON-schema support: use the text protocol from now on
+                print(f"⚠ Structured output unavailable ({e}); falling back to text parsing")
+                self.structured_output = False
+        if ai_response is None:
+            ai_response = self._stream_until_action(messages)
 
-        ai_response = response['message']['content']
         self.conversation_history.append({
             "role": "assistant",
             "content": ai_response
@@ -125,35 +281,40 @@ If just chatting, respond normally without JSON."""
 
         return ai_response
 
+    def _stream_until_action(self, messages):
+        """Stream a free-text reply, stopping as soon as an action object is complete"""
+        parser = IncrementalJSONParser()
+        parts = []
+        for chunk in ollama.chat(model=self.model, messages=messages, stream=True):
+            parts.append(chunk['message']['content'])
+            if parser.feed(parts[-1]) is not None:
+                # Closing the stream stops generation of any trailing chatter
+                break
+        return "".join(parts)
+
     def process_ai_response(self, ai_response):
         """Process AI response and execute actions"""
         try:
-            # Try to parse as JSON for action
-            if "{" in ai_response and "}" in ai_response:
-                json_start = ai_response.index("{")
-                json_end = ai_response.rindex("}") + 1
-                json_str = ai_response[json_start:json_end]
-                action_data = json.loads(json_str)
+            action_data = self.action_parser.parse(ai_response, structured=self.structured_output)
+            steps = plan_steps(action_data) if action_data else []
 
-                action = action_data.get("action")
-                params = action_data.get("parameters", {})
-                explanation = action_data.get("explanation", "")
+            if not steps:
+                # Just a conversational response
+                message = action_data.get("message", "") if action_data else ai_response
+                print(f"\n🤖 AI: {message}\n")
+                return message
 
-                print(f"\n🤖 AI Decision: {explanation}")
-                print(f"⚡ Executing: {action}")
+            print(f"\n🤖 AI Decision: {action_data.get('explanation', '')}")
+            observation = self.run_plan(steps)
+            print(f"✅ Result:\n{observation}\n")
 
-                result = self.execute_action(action, **params)
-                print(f"✅ Result: {result}\n")
+            # Let the model see what happened on its next turn
+            self.conversation_history.append({
+                "role": "user",
+                "content": f"Observation:\n{observation}"
+            })
+            return observation
 
-                return result
-            else:
-                # Just a conversational response
-                print(f"\n🤖 AI: {ai_response}\n")
-                return ai_response
-
-        except json.JSONDecodeError:
-            print(f"\n🤖 AI: {ai_response}\n")
-            return ai_response
         except Exception as e:
             print(f"❌ Error: {str(e)}")
             return str(e)
@@ -161,14 +322,27 @@ If just chatting, respond normally without JSON."""
     def chat(self, message):
         """Main chat interface"""
         print(f"\n👤 You: {message}")
+        self.current_request = message
         ai_response = self.ask_ollama(message)
         return self.process_ai_response(ai_response)
 
     def close_browser(self):
-        """Close the browser"""
+        """Close the browser (pooled drivers go back to the pool)"""
+        # Let queued screenshots finish writing first
+        try:
+            self.screenshots.flush()
+        except RuntimeError as e:
+            print(f"⚠️ {e}")
         if self.driver:
-            self.driver.quit()
+            if self.pool is not None:
+                self.pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
             print("Browser closed!")
+        if self.session_pool is not None:
+            self.session_pool.close()
+            self.session_pool = None
 
 
 # Example usage
@@ -178,6 +352,9 @@ if __name__ == "__main__":
 
     # Launch browser
     agent.launch_browser()
+    # Or reuse a warm headless browser shared with the other agents:
+    # from driverPool import get_pool
+    # agent.launch_browser(pool=get_pool(headless=True))
 
     try:
         # Interactive mode
@@ -186,16 +363,16 @@ if __name__ == "__main__":
         print("=" * 50)
 
         # Example commands
-        agent.chat("Navigate to https://www.amazon.in/ and search 'iphone 14 pro'")
-        time.sleep(5)
+        # One model turn plans and runs all three actions
+        agent.chat("Navigate to https://www.amazon.in/, search 'iphone 14 pro' and take a screenshot saved as Amazon.png")
 
-        agent.chat("Take a screenshot and save it as Amazon.png")
-        time.sleep(2)
+        agent.chat("What page am I on right now?")
 
-        agent.chat("Search Amazon for 'iphone 14 pro'")
-        time.sleep(3)
+        # Independent searches run in parallel browser sessions
+        # agent.chat("Compare prices for iphone 14 pro, pixel 8 and galaxy s23 on Amazon")
 
-        agent.chat("What page am I on right now?")
+        print(f"\n📊 Action parsing: {agent.action_parser.summary()}")
+        print(f"📊 {agent.actions_run} action(s) in {agent.llm_calls} model call(s)")
 
         # Interactive loop (uncomment to use)
         # while True:
@@ -0,0 +1,216 @@
+"""
+Action protocol between the browser agent and the model.
+
+Primary path: Ollama structured output (format=<JSON schema>), so the reply
+is always a parseable action plan. Fallback path (older Ollama or a model
+without schema support): a tolerant, incremental JSON parser that pulls the
+first action object out of free text, repairs common mistakes (code fences,
+single quotes, trailing commas, Python literals, truncated output) and can
+stop a streamed reply as soon as the object is complete.
+"""
+
+import json
+import re
+from collections import Counter
+
+# Action used when the model just wants to talk to the user
+REPLY_ACTION = "reply"
+
+
+class ActionFailed(Exception):
+    """Raised by an action to report failure; stops the rest of a plan"""
+
+
+def action_schema(action_names):
+    """JSON schema for one model turn: an ordered plan of actions plus an optional message
+
+    An empty plan with a message is a plain conversational reply.
+    """
+    step = {
+        "type": "object",
+        "properties": {
+            "action": {"type": "string", "enum": list(action_names)},
+            "parameters": {"type": "object"},
+        },
+        "required": ["action", "parameters"],
+    }
+    return {
+        "type": "object",
+        "properties": {
+            "plan": {"type": "array", "items": step},
+            "explanation": {"type": "string"},
+            "message": {"type": "string"},
+        },
+        "required": ["plan", "explanation"],
+    }
+
+
+def plan_steps(data):
+    """Normalize a parsed reply to a list of {"action", "parameters"} steps
+
+    Accepts the plan format as well as the older single-action object.
+    """
+    if isinstance(data.get("plan"), list):
+        steps = data["plan"]
+    elif data.get("action") and data["action"] != REPLY_ACTION:
+        steps = [data]
+    else:
+        steps = []
+    return [
+        {"action": step.get("action"), "parameters": step.get("parameters") or {}}
+        for step in steps if isinstance(step, dict) and step.get("action")
+    ]
+
+
+class IncrementalJSONParser:
+    """Feed text chunks; returns the first complete top-level {...} as soon as it closes"""
+
+    def __init__(self):
+        self.buffer = []
+        self.depth = 0
+        self.in_string = False
+        self.quote = None
+        self.escaped = False
+        self.start = None
+        self.length = 0
+
+    def feed(self, chunk):
+        """Returns the completed object text, or None if it is not closed yet"""
+        for ch in chunk:
+            self.buffer.append(ch)
+            self.length += 1
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == self.quote:
+                    self.in_string = False
+            elif ch in "\"'" and self.depth:
+                self.in_string, self.quote = True, ch
+            elif ch == "{":
+                if self.depth == 0:
+                    self.start = self.length - 1
+                self.depth += 1
+            elif ch == "}" and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    return "".join(self.buffer[self.start:])
+        return None
+
+    def partial(self):
+        """The unfinished object so far with its open strings/brackets closed"""
+        if self.start is None:
+            return None
+        text = "".join(self.buffer[self.start:])
+        if self.in_string:
+            text += self.quote
+        stack = []
+        in_string, quote, escaped = False, None, False
+        for ch in text:
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == quote:
+                    in_string = False
+            elif ch in "\"'":
+                in_string, quote = True, ch
+            elif ch in "{[":
+                stack.append("}" if ch == "{" else "]")
+            elif ch in "}]" and stack:
+                stack.pop()
+        return re.sub(r"[,:\s]+$", "", text) + "".join(reversed(stack))
+
+
+_FENCE = re.compile(r"```(?:json)?")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_UNQUOTED_KEY = re.compile(r"([{,]\s*)([A-Za-z_]\w*)\s*:")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def _repair(text):
+    """Best-effort fixes for the JSON mistakes small models make"""
+    # Single quotes first: quoting bare keys below adds double quotes
+    if '"' not in text:
+        text = text.replace("'", '"')
+    text = _TRAILING_COMMA.sub(r"\1", text)
+    text = _UNQUOTED_KEY.sub(r'\1"\2":', text)
+    text = re.sub(r"\b(True|False|None)\b", lambda m: _PY_LITERALS[m.group(1)], text)
+    return text
+
+
+def _loads(text):
+    for candidate in (text, _repair(text)):
+        try:
+            value = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+def extract_json_object(text):
+    """First JSON object in free text, repaired if needed (None if there is none)"""
+    text = _FENCE.sub("", text)
+    parser = IncrementalJSONParser()
+    remaining = text
+    while remaining:
+        complete = parser.feed(remaining)
+        if complete is None:
+            # Truncated reply: try closing what is open
+            partial = parser.partial()
+            return _loads(partial) if partial else None
+        value = _loads(complete)
+        if value is not None:
+            return value
+        # Not an object we can read (e.g. "{placeholder}"); keep scanning after it
+        remaining = remaining[remaining.index(complete) + len(complete):]
+        parser = IncrementalJSONParser()
+    return None
+
+
+class ActionParser:
+    """Parse model replies into action dicts and keep success statistics"""
+
+    def __init__(self):
+        self.stats = Counter()
+
+    def parse(self, text, structured=False):
+        """Returns an action dict, or None for a plain conversational reply"""
+        self.stats["total"] += 1
+        if structured:
+            try:
+                action = json.loads(text)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if not isinstance(action, dict):
+                    # Valid JSON but not an action object (e.g. a bare list)
+                    self.stats["failed"] += 1
+                    return None
+                self.stats["structured"] += 1
+                return action
+
+        action = extract_json_object(text) if "{" in text else None
+        if action is None:
+            self.stats["conversation" if "{" not in text else "failed"] += 1
+        elif "action" not in action and "plan" not in action:
+            self.stats["failed"] += 1
+            action = None
+        else:
+            self.stats["recovered"] += 1
+        return action
+
+    def success_rate(self):
+        """Share of replies that yielded an action or a clean conversational reply"""
+        if not self.stats["total"]:
+            return 1.0
+        return 1 - self.stats["failed"] / self.stats["total"]
+
+    def summary(self):
+        return (f"{self.stats['total']} replies: {self.stats['structured']} structured, "
+                f"{self.stats['recovered']} recovered from text, {self.stats['conversation']} chat, "
+                f"{self.stats['failed']} unparseable ({self.success_rate():.0%} success)")
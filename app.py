@@ -2,41 +2,39 @@ from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.ui import Console
 from autogen_agentchat.conditions import MaxMessageTermination
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-import httpx
+from modelClients import get_model_client
+from prompts import GENERAL_ASSISTANT_MESSAGE
+from teamMetrics import TeamMetrics
 
-# Model configuration
-model_client = OpenAIChatCompletionClient(
-    model="qwen2.5",
-    api_key="ollama",
-    base_url="http://localhost:11434/v1/",
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-        "structured_output": False,
-    },
-    timeout=httpx.Timeout(300.0, connect=60.0),
-)
 
-# Create a simple assistant
-assistant = AssistantAgent(
-    name="Assistant",
-    model_client=model_client,
-    system_message="You are a helpful AI assistant. Answer questions clearly and concisely.",
-)
+def build_team(metrics=None):
+    """A single-assistant team; nothing is created until this is called"""
+    # Model configuration (shared connection pool, timeouts and model_info)
+    model_client = get_model_client("qwen2.5")
+    if metrics is not None:
+        model_client = metrics.wrap_model_client(model_client, "Assistant")
 
-# Create a team with just the assistant
-team = RoundRobinGroupChat(
-    [assistant],
-    termination_condition=MaxMessageTermination(5),
-)
+    # Create a simple assistant (streamed when measuring, for time-to-first-token)
+    assistant = AssistantAgent(
+        name="Assistant",
+        model_client=model_client,
+        system_message=GENERAL_ASSISTANT_MESSAGE,
+        model_client_stream=metrics is not None,
+    )
+
+    # Create a team with just the assistant
+    return RoundRobinGroupChat(
+        [assistant],
+        termination_condition=MaxMessageTermination(5),
+    )
 
 # Run
 async def main():
-    await Console(team.run_stream(task="Hi Can you pls create a program for factorial number in python."))
+    metrics = TeamMetrics(trace_path="app_trace.jsonl")
+    team = build_team(metrics=metrics)
+    await Console(metrics.trace(team.run_stream(task="Hi Can you pls create a program for factorial number in python.")))
+    metrics.report()
 
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -2,73 +2,98 @@ from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent
 from autogen_agentchat.ui import Console
 from autogen_agentchat.conditions import TextMentionTermination
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_ext.code_executors.docker import DockerCommandLineCodeExecutor
+from modelClients import get_model_client
+from localExecutor import create_code_executor
+from executionCache import CachingCodeExecutor
+from prompts import CODER_SYSTEM_MESSAGE
+from summarizingContext import SummarizingChatContext
+from teamMetrics import TeamMetrics
+from terminations import ExecutionSuccessTermination
 from pathlib import Path
 
-# Define the model configuration for Ollama with model_info
-model_client = OpenAIChatCompletionClient(
-    model="qwen2.5",
-    api_key="ollama",  # Ollama doesn't require a real API key
-    base_url='http://localhost:11434/v1',  # Ollama's OpenAI-compatible endpoint
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-        "structured_output": False,  # Added to suppress warning
-    }
-)
-
-# Setting up the code executor using Docker
+# Importing this module only defines things: the executor, agents and team
+# are built on first use, so other scripts can compose them freely.
+
 workdir = Path("coding")
-workdir.mkdir(exist_ok=True)
-code_executor = DockerCommandLineCodeExecutor(work_dir=workdir)
-
-# System message for the assistant
-system_message = """You are a helpful AI assistant who writes code and the user
-executes it. Solve tasks using your python coding skills.
-In the following cases, suggest python code (in a python coding block) for the
-user to execute. When using code, you must indicate the script type in the code block.
-You only need to create one working sample.
-Do not suggest incomplete code which requires users to modify it.
-Don't use a code block if it's not intended to be executed by the user. Don't
-include multiple code blocks in one response. Do not ask users to copy and
-paste the result. Instead, use 'print' function for the output when relevant.
-Check the execution result returned by the user.
-
-If the result indicates there is an error, fix the error.
-
-IMPORTANT: If it has executed successfully, ONLY output 'FINISH'."""
-
-# The AssistantAgent that writes code
-assistant_agent = AssistantAgent(
-    name="Assistant",
-    model_client=model_client,
-    system_message=system_message,
-)
-
-# The code executor agent - uses CodeExecutorAgent, not AssistantAgent
-executor_agent = CodeExecutorAgent(
-    name="Executor",
-    code_executor=code_executor,
-)
-
-# Set up termination condition
-termination = TextMentionTermination("FINISH")
-
-# Create a team with the agents
-team = RoundRobinGroupChat(
-    [assistant_agent, executor_agent],
-    termination_condition=termination,
-)
+
+# System message for the assistant (kept here for scripts that import it from app1)
+system_message = CODER_SYSTEM_MESSAGE
+
+_code_executor = None
+
+
+def new_code_executor(work_dir=workdir):
+    """A caching code executor on its own work dir
+
+    Docker by default, CODE_EXECUTOR=local for the warm local pool. Identical
+    re-runs (same code, same workdir files) are served from the cache; code
+    marked "# no-cache" or using randomness, the clock, network or input always runs.
+    """
+    return CachingCodeExecutor(create_code_executor(work_dir))
+
+
+def get_code_executor():
+    """The process-wide code executor on coding/, created on first use"""
+    global _code_executor
+    if _code_executor is None:
+        _code_executor = new_code_executor(workdir)
+    return _code_executor
+
+
+def build_team(max_turns=None, metrics=None, expected_output=None, code_executor=None):
+    """A fresh assistant/executor team sharing the model client
+
+    Pass a TeamMetrics to time each agent's model calls and code runs,
+    expected_output (substring, regex or callable) to require it in a successful
+    run, and code_executor to run code somewhere other than the shared coding/ executor.
+    """
+    # Define the model configuration for Ollama (shared connection pool, timeouts and model_info)
+    model_client = get_model_client("qwen2.5")
+    code_executor = code_executor or get_code_executor()
+    if metrics is not None:
+        model_client = metrics.wrap_model_client(model_client, "Assistant")
+        code_executor = metrics.wrap_executor(code_executor, "Executor")
+
+    # The AssistantAgent that writes code (streamed when measuring, for time-to-first-token).
+    # Its context keeps the task and latest code, trims tracebacks and summarizes older
+    # attempts, so long fix loops stay within qwen2.5's context window.
+    assistant_agent = AssistantAgent(
+        name="Assistant",
+        model_client=model_client,
+        system_message=system_message,
+        model_client_stream=metrics is not None,
+        model_context=SummarizingChatContext(max_tokens=3000),
+    )
+
+    # The code executor agent - uses CodeExecutorAgent, not AssistantAgent
+    executor_agent = CodeExecutorAgent(
+        name="Executor",
+        code_executor=code_executor,
+    )
+
+    # Stop right after the first successful run, or when the assistant says FINISH
+    # (termination conditions are stateful, so one per team)
+    termination = (
+        ExecutionSuccessTermination(sources=[executor_agent.name], expected_output=expected_output)
+        | TextMentionTermination("FINISH")
+    )
+
+    # Create a team with the agents
+    return RoundRobinGroupChat(
+        [assistant_agent, executor_agent],
+        termination_condition=termination,
+        max_turns=max_turns,
+    )
 
 # Run the conversation
 async def main():
+    metrics = TeamMetrics(trace_path="app1_trace.jsonl")
+    team = build_team(metrics=metrics)
     task = "Write a Python script that calculates the factorial of 5 and prints the result."
-    await Console(team.run_stream(task=task))
+    await Console(metrics.trace(team.run_stream(task=task)))
+    metrics.report()
 
 # If running as a regular Python script:
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
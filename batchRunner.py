@@ -0,0 +1,90 @@
+"""
+Line-oriented batch runs shared by the --batch modes (test1, chatAssistAI).
+
+    items = load_items("tasks.txt", "task", extra=("expected",))
+    await run_batch(items, run_task, "results.ndjson", concurrency=4)
+
+Input is one item per line, plain text or JSON, from a file or stdin ("-").
+Lines are read only as slots free up, so a slow producer piping into stdin
+is processed while it is still writing, and at most `concurrency` items are
+in flight. Records are written as JSON lines in completion order and
+flushed one by one.
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+
+def load_items(path, field, extra=()):
+    """Yield {"id", field, *extra} per non-empty, non-comment line
+
+    Plain lines become the field's value. JSON lines must have the field and
+    may set "id" and any of extra. A line that can't be parsed yields an item
+    with "error" instead of ending the batch.
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    with stream:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            item = {"id": number, field: line, **{key: None for key in extra}}
+            if line.startswith("{"):
+                try:
+                    data = json.loads(line)
+                    item.update({key: data.get(key) for key in extra}, id=data.get("id", number))
+                    item[field] = data[field]
+                except (ValueError, KeyError, AttributeError) as e:
+                    item["error"] = f"Invalid line {number}: {e!r}"
+            yield item
+
+
+async def run_batch(items, worker, out_path, concurrency=4, label="items"):
+    """Run worker(item) over items with at most `concurrency` running at once
+
+    Args:
+        items: Iterable of items; pulled lazily (off the event loop, since stdin blocks)
+        worker: Coroutine function item -> record dict; must not raise. Records
+            with "ok": False or an "error" count as failures.
+        out_path: JSONL file the records are written to as they complete
+        concurrency: Most items in flight
+        label: Noun for the progress lines
+    """
+    items = iter(items)
+    running = set()
+    fetch = None  # the pending read of the next item, at most one at a time
+    exhausted = False
+    done_count = succeeded = 0
+    print(f"📋 Running {label} with concurrency {concurrency} -> {out_path}")
+
+    started = time.perf_counter()
+    with open(out_path, "w", encoding="utf-8") as out:
+        while True:
+            if fetch is None and not exhausted and len(running) < concurrency:
+                fetch = asyncio.ensure_future(asyncio.to_thread(next, items, None))
+            waiting = running | {fetch} if fetch is not None else running
+            if not waiting:
+                break
+            finished, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if fetch in finished:
+                finished.discard(fetch)
+                item, fetch = fetch.result(), None
+                if item is None:
+                    exhausted = True
+                else:
+                    running.add(asyncio.create_task(worker(item)))
+            for task in finished:
+                running.discard(task)
+                record = task.result()
+                ok = record.get("ok", "error" not in record)
+                done_count += 1
+                succeeded += bool(ok)
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                print(f"{'✓' if ok else '✗'} [{record.get('id')}] {record.get('seconds', 0):.1f}s")
+    elapsed = time.perf_counter() - started
+    rate = done_count / elapsed if elapsed else 0.0
+    print(f"\n✓ {succeeded}/{done_count} {label} finished in {elapsed:.1f}s ({rate:.2f}/s)")
+    return succeeded, done_count
@@ -0,0 +1,236 @@
+"""
+Deterministic agent-loop benchmarks against the Ollama stub.
+
+Each scenario drives one entry point for a fixed number of iterations
+against ollamaStub with scripted replies and fixed simulated latency, so
+runs are repeatable and the difference between wall time and simulated
+model time is the orchestration overhead of that entry point (prompt
+building, client stacks, parsing, executors, termination checks).
+
+    python benchmark.py                        # every scenario, zero model latency
+    python benchmark.py app1 LaunchBrowser -n 20 --ttft 0.1 --token-latency 0.01 --json bench.json
+
+Scenarios whose dependencies aren't installed are reported as skipped.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+from ollamaStub import OllamaStub, StubScript
+
+
+async def _app():
+    """app.py: single assistant, MaxMessageTermination(5) -> 4 model calls"""
+    import app
+
+    async def run():
+        await app.build_team().run(task="Create a program for factorial number in python.")
+    return run, StubScript(default="Here is a factorial program in Python.")
+
+
+async def _app1():
+    """app1.py: assistant writes code, local executor runs it, success termination ends the run"""
+    os.environ.setdefault("CODE_EXECUTOR", "local")
+    import app1
+
+    # "# no-cache" so every iteration really executes
+    reply = "```python\n# no-cache\nimport math\nprint(math.factorial(5))\n```"
+
+    async def run():
+        await app1.build_team(max_turns=10).run(task="Calculate the factorial of 5 and print it.")
+    return run, StubScript(default=reply)
+
+
+def _testMCP():
+    """testMCP.py: tool-calling loop, model answers without tools (no browser needed)"""
+    from testMCP import AdvancedOllamaAgent
+
+    agent = AdvancedOllamaAgent(model="qwen2.5")
+    return lambda: agent.run_agent("Say hello"), StubScript(default="Hello! No browser action needed.")
+
+
+def _LaunchBrowser():
+    """LaunchBrowser.py: structured-output plan turn with an empty plan (no browser needed)"""
+    from LaunchBrowser import OllamaAIBrowserAgent
+
+    agent = OllamaAIBrowserAgent(model="qwen2.5")
+    reply = json.dumps({"plan": [], "explanation": "greeting", "message": "Hi! What should I open?"})
+
+    def run():
+        agent.conversation_history = []
+        agent.chat("hello")
+    return run, StubScript(default=reply)
+
+
+def _AIJiraReport():
+    """AIJiraReport.py: one assistant turn with all tool schemas (Jira is never contacted)"""
+    import AIJiraReport
+
+    def run():
+        AIJiraReport.assistant.generate_reply(messages=[{"role": "user", "content": "Get details of SCRUM-1"}])
+    return run, StubScript(default="SCRUM-1 is an open task. TERMINATE")
+
+
+def _chatAssistAI():
+    """chatAssistAI.py: prompt | llm | parser, one question"""
+    import chatAssistAI
+
+    chain = chatAssistAI.build_chain()
+    return lambda: chain.invoke({"question": "What is 2+2?"}), StubScript(default="2 + 2 = 4.")
+
+
+SCENARIOS = {
+    "app": _app,
+    "app1": _app1,
+    "testMCP": _testMCP,
+    "LaunchBrowser": _LaunchBrowser,
+    "AIJiraReport": _AIJiraReport,
+    "chatAssistAI": _chatAssistAI,
+}
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+class Benchmark:
+    """Runs scenarios against one stub server"""
+
+    def __init__(self, stub, iterations=5, warmup=1, verbose=False):
+        self.stub = stub
+        self.iterations = iterations
+        self.warmup = warmup
+        self.verbose = verbose
+
+    def _quiet(self):
+        return contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    def _measure(self, samples, wall, before):
+        stats = self.stub.stats
+        samples.append({
+            "wall": wall,
+            "model": stats["simulated_seconds"] - before["simulated_seconds"],
+            "requests": stats["requests"] - before["requests"],
+            "completion_tokens": stats["completion_tokens"] - before["completion_tokens"],
+        })
+
+    def _run_sync(self, run):
+        samples = []
+        for i in range(self.warmup + self.iterations):
+            before = dict(self.stub.stats)
+            started = time.perf_counter()
+            run()
+            if i >= self.warmup:
+                self._measure(samples, time.perf_counter() - started, before)
+        return samples
+
+    async def _run_async(self, setup):
+        # Setup and every iteration share one loop, so its HTTP pool and model client stay warm.
+        # Each scenario runs its own asyncio.run(); modelClients keys pools per loop, so nothing
+        # is reused from a previous scenario's closed loop.
+        run, script = await setup()
+        self.stub.script = script
+        samples = []
+        for i in range(self.warmup + self.iterations):
+            before = dict(self.stub.stats)
+            started = time.perf_counter()
+            await run()
+            if i >= self.warmup:
+                self._measure(samples, time.perf_counter() - started, before)
+        return samples
+
+    def run(self, name):
+        setup = SCENARIOS[name]
+        self.stub.reset_stats()
+        try:
+            with self._quiet():
+                if asyncio.iscoroutinefunction(setup):
+                    samples = asyncio.run(self._run_async(setup))
+                else:
+                    run, script = setup()
+                    self.stub.script = script
+                    samples = self._run_sync(run)
+        except ImportError as e:
+            return {"scenario": name, "skipped": f"missing dependency: {e.name or e}"}
+        except Exception as e:
+            return {"scenario": name, "error": f"{type(e).__name__}: {e}"}
+
+        walls = [s["wall"] for s in samples]
+        overheads = [s["wall"] - s["model"] for s in samples]
+        return {
+            "scenario": name,
+            "iterations": len(samples),
+            "requests_per_iter": statistics.mean(s["requests"] for s in samples),
+            "wall_mean": statistics.mean(walls),
+            "wall_p50": _percentile(walls, 0.5),
+            "wall_p95": _percentile(walls, 0.95),
+            "model_mean": statistics.mean(s["model"] for s in samples),
+            "overhead_mean": statistics.mean(overheads),
+            "overhead_per_request": statistics.mean(
+                o / s["requests"] for o, s in zip(overheads, samples) if s["requests"]
+            ) if any(s["requests"] for s in samples) else None,
+        }
+
+
+def format_results(results):
+    lines = [
+        f"{'Scenario':<15}{'Req/it':>7}{'Wall ms':>9}{'p50':>8}{'p95':>8}{'Model ms':>10}{'Overhead':>10}{'/req':>8}",
+        "-" * 75,
+    ]
+    for r in results:
+        if "iterations" not in r:
+            lines.append(f"{r['scenario']:<15}{r.get('skipped') or r.get('error')}")
+            continue
+        per_request = f"{r['overhead_per_request'] * 1000:.1f}" if r["overhead_per_request"] is not None else "-"
+        lines.append(
+            f"{r['scenario']:<15}{r['requests_per_iter']:>7.1f}{r['wall_mean'] * 1000:>9.1f}"
+            f"{r['wall_p50'] * 1000:>8.1f}{r['wall_p95'] * 1000:>8.1f}{r['model_mean'] * 1000:>10.1f}"
+            f"{r['overhead_mean'] * 1000:>10.1f}{per_request:>8}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark agent entry points against the Ollama stub")
+    parser.add_argument("scenarios", nargs="*", help=f"Any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("-n", "--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--ttft", type=float, default=0.0, help="Simulated seconds to first token")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Simulated seconds per token")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show the scripts' own output")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    stub = OllamaStub(ttft=args.ttft, token_latency=args.token_latency).start()
+    # Point every client at the stub before any entry point is imported
+    os.environ["OLLAMA_BASE_URL"] = stub.url
+    os.environ["OLLAMA_HOST"] = stub.url
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    print(f"🧪 Stub at {stub.url} (ttft {args.ttft}s, {args.token_latency}s/token), "
+          f"{args.iterations} iterations after {args.warmup} warmup")
+    bench = Benchmark(stub, args.iterations, args.warmup, args.verbose)
+    results = []
+    for name in args.scenarios or SCENARIOS:
+        print(f"⏱ {name}...")
+        results.append(bench.run(name))
+    stub.stop()
+
+    print()
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📝 Results written to {args.json}")
@@ -1,25 +1,77 @@
-from click import prompt
+import os
+import time
+
 from langchain_community.llms import Ollama
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_ollama import OllamaLLM
 
-# Initialize the Ollama LLM
-# Ensure the model (e.g., "llama3") is pulled and the Ollama service is running
-llm = Ollama(model="llama3")
+from batchRunner import load_items, run_batch
+
+# Read here rather than from modelClients, which would pull in httpx for one string
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
+
+# Batch mode builds the chain once and keeps `concurrency` questions in flight.
+# Ollama answers up to OLLAMA_NUM_PARALLEL requests per model at once, so set
+# --concurrency to match it; anything above just queues in the server.
+
+
+def build_chain(model="llama3", base_url=OLLAMA_BASE_URL):
+    """prompt | llm | parser for one-shot questions"""
+    # Initialize the Ollama LLM
+    # Ensure the model (e.g., "llama3") is pulled and the Ollama service is running
+    llm = Ollama(model=model, base_url=base_url)
+
+    # Define a simple prompt template
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are a helpful assistant. Answer the user's questions to the best of your ability."),
+        ("human", "{question}")
+    ])
+
+    # Create the LangChain pipeline (chain)
+    # This connects the prompt, model, and an output parser
+    return prompt | llm | StrOutputParser()
+
+
+def answer_with(chain):
+    """Coroutine answering one batch item with its latency; never raises"""
+    async def answer(item):
+        record = {"id": item["id"], "question": item["question"]}
+        if item.get("error"):
+            return dict(record, error=item["error"], seconds=0.0)
+        started = time.perf_counter()
+        try:
+            record["answer"] = await chain.ainvoke({"question": item["question"]})
+        except Exception as e:
+            record["error"] = str(e)
+        record["seconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    return answer
+
+
+def main():
+    chain = build_chain()
+
+    # Invoke the chain with a question
+    question = input("Ask your question: ")
+    response = chain.invoke({"question": question})
+
+    print(response)
 
-# Define a simple prompt template
-prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are a helpful assistant. Answer the user's questions to the best of your ability."),
-    ("human", "{question}")
-])
 
-# Create the LangChain pipeline (chain)
-# This connects the prompt, model, and an output parser
-chain = prompt | llm | StrOutputParser()
+if __name__ == "__main__":
+    import argparse
+    import asyncio
 
-# Invoke the chain with a question
-question = input("Ask your question: ")
-response = chain.invoke({"question": question})
+    parser = argparse.ArgumentParser(description="Ask the assistant one question, or a file of them")
+    parser.add_argument("--batch", help="File of questions, one per line ('-' for stdin)")
+    parser.add_argument("--out", default="answers.jsonl", help="JSONL answers file for --batch")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Questions in flight in --batch mode (match OLLAMA_NUM_PARALLEL)")
+    args = parser.parse_args()
 
-print(response)
+    if args.batch:
+        questions = load_items(args.batch, "question")
+        asyncio.run(run_batch(questions, answer_with(build_chain()), args.out, args.concurrency, label="questions"))
+    else:
+        main()
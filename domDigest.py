@@ -0,0 +1,164 @@
+"""
+Compact DOM digest used as prompt context for XPath generation.
+
+One execute_script call collects the visible interactive and landmark
+elements (tag, id, name, aria, text, classes) and the digest is rendered
+into a token-budgeted text block, e.g.:
+
+    nav#nav-main aria="Main"
+    input#twotabsearchtextbox name=field-keywords type=text placeholder="Search Amazon.in"
+    a .nav-a text="Air conditioners"
+
+Results are cached per URL + DOM signature (element counts plus a hash of
+the page text), so repeated prompts on an unchanged page cost a single
+lightweight round trip.
+"""
+
+from collections import OrderedDict
+
+from tokenBudget import CHARS_PER_TOKEN
+
+# Returns only the signature when it matches the caller's cached one
+DIGEST_JS = """
+var known = arguments[0];
+var INTERACTIVE = 'a,button,input,select,textarea,summary,label,[role=button],[role=link],' +
+                  '[role=tab],[role=menuitem],[onclick],[contenteditable=true]';
+var LANDMARK = 'header,nav,main,footer,aside,form,h1,h2,h3,[role=navigation],[role=search],' +
+               '[role=banner],[role=main],[role=dialog]';
+var all = document.getElementsByTagName('*').length;
+var interactive = document.querySelectorAll(INTERACTIVE);
+var landmarks = document.querySelectorAll(LANDMARK);
+// Cheap 32-bit FNV-1a over the page text, so text-only changes (prices, status
+// messages, validation errors) also invalidate the cached digest
+var text = document.body ? document.body.textContent : '';
+var hash = 0x811c9dc5;
+for (var t = 0; t < text.length; t++) {
+  hash ^= text.charCodeAt(t);
+  hash = Math.imul(hash, 0x01000193);
+}
+var signature = [location.href, all, interactive.length, landmarks.length, text.length, hash >>> 0].join('|');
+if (signature === known) { return {signature: signature, elements: null}; }
+
+var visible = function (el) {
+  if (el.type === 'hidden') { return false; }
+  var r = el.getBoundingClientRect();
+  if (r.width === 0 && r.height === 0) { return false; }
+  var cs = window.getComputedStyle(el);
+  return cs.visibility !== 'hidden' && cs.display !== 'none';
+};
+var clip = function (s, n) {
+  s = (s || '').replace(/\\s+/g, ' ').trim();
+  return s.length > n ? s.slice(0, n) + '…' : s;
+};
+var seen = new Set();
+var out = [];
+var collect = function (list, kind) {
+  for (var i = 0; i < list.length; i++) {
+    var el = list[i];
+    if (seen.has(el) || !visible(el)) { continue; }
+    seen.add(el);
+    out.push({
+      kind: kind,
+      tag: el.tagName.toLowerCase(),
+      id: el.id || '',
+      name: el.getAttribute('name') || '',
+      type: el.getAttribute('type') || '',
+      role: el.getAttribute('role') || '',
+      aria: clip(el.getAttribute('aria-label'), 40),
+      placeholder: clip(el.getAttribute('placeholder'), 40),
+      testid: el.getAttribute('data-testid') || '',
+      text: clip(kind === 'landmark' && !/^H[1-3]$/.test(el.tagName) ? '' : el.innerText, 50),
+      classes: (typeof el.className === 'string' ? el.className.trim().split(/\\s+/) : []).slice(0, 2)
+    });
+  }
+};
+collect(landmarks, 'landmark');
+collect(interactive, 'interactive');
+// Interleave landmarks and controls back into document order
+var nodes = Array.from(seen);
+var order = new Map(nodes.map(function (el, i) { return [el, i]; }));
+nodes.sort(function (a, b) {
+  return a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1;
+});
+return {signature: signature, elements: nodes.map(function (el) { return out[order.get(el)]; })};
+"""
+
+
+def _score(element):
+    """Higher scores survive budget trimming first"""
+    score = 0
+    if element.get("id"):
+        score += 3
+    if element.get("testid") or element.get("name"):
+        score += 2
+    if element.get("aria") or element.get("text") or element.get("placeholder"):
+        score += 2
+    if element.get("kind") == "landmark":
+        score += 1
+    return score
+
+
+def format_element(element):
+    """Render one element record as a compact single line"""
+    head = element["tag"]
+    if element.get("id"):
+        head += f"#{element['id']}"
+    parts = [head]
+    for key in ("name", "type", "role", "testid"):
+        if element.get(key):
+            parts.append(f"{key}={element[key]}")
+    for key in ("aria", "placeholder", "text"):
+        if element.get(key):
+            parts.append(f'{key}="{element[key]}"')
+    if element.get("classes"):
+        parts.append("." + ".".join(element["classes"]))
+    return " ".join(parts)
+
+
+def format_digest(elements, max_tokens=1500):
+    """Render element records within a token budget, keeping document order"""
+    budget = max_tokens * CHARS_PER_TOKEN
+    lines = [(i, format_element(e)) for i, e in enumerate(elements)]
+
+    ranked = sorted(lines, key=lambda item: -_score(elements[item[0]]))
+    kept, used = [], 0
+    for index, line in ranked:
+        if used + len(line) + 1 > budget:
+            continue
+        kept.append((index, line))
+        used += len(line) + 1
+
+    kept.sort()
+    return "\n".join(line for _, line in kept)
+
+
+class DomDigest:
+    """Extract and cache DOM digests for the page loaded in a WebDriver"""
+
+    def __init__(self, max_tokens=1500, cache_size=32):
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (url, signature) -> digest text
+        self._signatures = {}  # url -> last signature seen
+
+    def get(self, driver):
+        """Return the digest text for the driver's current page"""
+        url = driver.current_url
+        known = self._signatures.get(url)
+        result = driver.execute_script(DIGEST_JS, known)
+        key = (url, result["signature"])
+
+        if result["elements"] is None and key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if result["elements"] is None:
+            # Cache was evicted; force a full collection
+            result = driver.execute_script(DIGEST_JS, None)
+            key = (url, result["signature"])
+
+        text = format_digest(result["elements"], self.max_tokens)
+        self._signatures[url] = result["signature"]
+        self._cache[key] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
@@ -0,0 +1,205 @@
+"""
+Reusable Chrome WebDriver pool shared by the browser agents
+(OllamaAIBrowserAgent, AdvancedOllamaAgent, SimpleXPathGenerator).
+
+Starting Chrome costs seconds; the pool keeps warm browser processes around
+and hands them out with cookies/storage cleared between checkouts.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+
+def build_chrome_options(headless=True, window_size="1920,1080"):
+    """Chrome options used for pooled drivers"""
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={window_size}")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    return options
+
+
+class WebDriverPool:
+    """Thread-safe pool of warm Chrome drivers"""
+
+    def __init__(self, size=2, headless=True, prewarm=0, max_uses=50):
+        self.size = size
+        self.headless = headless
+        # Recycle a browser after this many checkouts to bound memory growth
+        self.max_uses = max_uses
+        self._idle = []  # LIFO: the most recently used browser is the warmest
+        self._uses = {}
+        # Browsers alive or being started; a slot is reserved before Chrome launches
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        for _ in range(min(prewarm, size)):
+            with self._cond:
+                self._created += 1
+            self._idle.append(self._create_driver())
+
+    def _create_driver(self):
+        """Start Chrome for a slot already counted in _created; gives the slot back on failure"""
+        try:
+            driver = webdriver.Chrome(options=build_chrome_options(self.headless))
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._cond:
+            self._created -= 1
+            self._uses.pop(id(driver), None)
+            # A waiter can now start a replacement
+            self._cond.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _clear_browser_data(driver, origins):
+        """Clear cookies and storage of every site, not just the open tab's (CDP)
+
+        The HTTP cache is kept: it holds no per-user state and keeps the browser warm.
+
+        Storage can only be cleared per origin, so it is cleared for every origin
+        that has cookies or was open in a tab, plus "*" for Chrome versions that
+        accept it as "all origins".
+        """
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        for cookie in cookies:
+            domain = cookie["domain"].lstrip(".")
+            origins.update({f"https://{domain}", f"http://{domain}"})
+        for origin in sorted(origins) + ["*"]:
+            try:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            except WebDriverException:
+                pass
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    def _reset_state(self, driver):
+        """Clear cookies, storage and extra tabs so the next user starts clean"""
+        origins = set()
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            origins.add(self._origin(driver.current_url))
+            driver.close()
+        driver.switch_to.window(handles[0])
+        origins.add(self._origin(driver.current_url))
+        origins.discard(None)
+        try:
+            self._clear_browser_data(driver, origins)
+        except (AttributeError, WebDriverException):
+            # Not a Chromium driver: only the current origin can be cleared
+            driver.delete_all_cookies()
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+        driver.get("about:blank")
+
+    @staticmethod
+    def _origin(url):
+        parts = urlsplit(url or "")
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            return None
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def acquire(self, timeout=None):
+        """Check out a driver, starting a new browser only if none is idle
+
+        Raises:
+            TimeoutError: If no driver became available within timeout seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("WebDriverPool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                    self._uses[id(driver)] += 1
+                    return driver
+                if self._created < self.size:
+                    # Reserve the slot now so concurrent acquires can't overshoot size
+                    self._created += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No WebDriver available within {timeout}s")
+                self._cond.wait(remaining)
+
+        # Launch outside the lock; Chrome takes seconds to start
+        driver = self._create_driver()
+        with self._cond:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver):
+        """Return a driver to the pool with its state cleared"""
+        if self._closed or self._uses.get(id(driver), 0) >= self.max_uses:
+            self._discard(driver)
+            return
+
+        try:
+            self._reset_state(driver)
+        except Exception:
+            # Browser crashed or hung; replace it on next acquire
+            self._discard(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager: with pool.driver() as driver: ..."""
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit every idle browser; drivers still checked out are quit on release"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool(size=2, headless=True):
+    """Process-wide shared pool (created on first use)"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool._closed:
+            _default_pool = WebDriverPool(size=size, headless=headless)
+        return _default_pool
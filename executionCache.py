@@ -0,0 +1,175 @@
+"""
+Content-addressed cache for code execution results.
+
+In the assistant/executor loops the assistant often re-emits a code block it
+already sent, and the executor would run it again from scratch. The cache
+key is a SHA-256 over each block's language and code plus the contents of
+the files in the executor's work dir before the run, so a repeat run is
+only served from the cache when the code *and* its inputs are unchanged.
+Code that changes its own inputs (appending to a file, say) gets a new key
+on the next run and really executes again.
+
+Runs are cached by default. Code is never cached when a block contains
+the "# no-cache" marker or uses something that can change between
+identical runs (randomness, the clock, the network, user input,
+subprocesses). That check is a heuristic over the code text, so mark
+anything else non-deterministic explicitly. Entries expire after max_age
+seconds and the least recently used ones are evicted beyond max_entries /
+max_bytes.
+"""
+
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeExecutor
+
+NO_CACHE_MARKER = "# no-cache"
+
+# Code that can give a different result on an identical rerun
+NONDETERMINISTIC = re.compile(
+    r"\b(random|secrets|uuid|time\.time|time\.perf_counter|time\.monotonic|datetime\.now|datetime\.today"
+    r"|date\.today|os\.urandom|input\s*\(|requests|urllib|httpx|socket|subprocess|os\.system)\b"
+)
+
+# Executor results that say nothing about the code itself
+TIMEOUT_EXIT_CODE = 124
+
+
+def is_cacheable(code_blocks):
+    """False if any block opts out with "# no-cache" or looks non-deterministic"""
+    for block in code_blocks:
+        if NO_CACHE_MARKER in block.code or NONDETERMINISTIC.search(block.code):
+            return False
+    return bool(code_blocks)
+
+
+class CachingCodeExecutor(CodeExecutor):
+    """Wrap another CodeExecutor and serve repeated identical runs from memory"""
+
+    def __init__(self, executor, work_dir=None, max_entries=256, max_bytes=16 * 1024 * 1024, max_age=3600,
+                 max_file_hashes=4096):
+        """
+        Args:
+            executor: The CodeExecutor doing the real work
+            work_dir: Directory whose files count as inputs (defaults to executor.work_dir)
+            max_entries: Most results kept
+            max_bytes: Most output bytes kept across all results
+            max_age: Seconds before an entry expires
+            max_file_hashes: Most memoized work dir file digests kept
+        """
+        self.executor = executor
+        work_dir = work_dir if work_dir is not None else getattr(executor, "work_dir", None)
+        self.work_dir = Path(work_dir) if work_dir is not None else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries = OrderedDict()  # key -> (stored_at, size, result)
+        self._bytes = 0
+        self.max_file_hashes = max_file_hashes
+        self._file_hashes = OrderedDict()  # (path, size, mtime_ns) -> digest, LRU
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "evicted": 0}
+
+    def _file_digest(self, path, stat):
+        memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._file_hashes.get(memo_key)
+        if digest is not None:
+            self._file_hashes.move_to_end(memo_key)
+            return digest
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._file_hashes[memo_key] = digest
+        while len(self._file_hashes) > self.max_file_hashes:
+            self._file_hashes.popitem(last=False)
+        return digest
+
+    def _workdir_fingerprint(self):
+        """Hash of every input file under the work dir (hidden and per-run temp dirs skipped)"""
+        h = hashlib.sha256()
+        if self.work_dir is None or not self.work_dir.is_dir():
+            return h.hexdigest()
+        for root, dirs, files in os.walk(self.work_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith((".", "run_", "__pycache__")))
+            for name in sorted(files):
+                path = Path(root) / name
+                try:
+                    stat = path.stat()
+                    digest = self._file_digest(path, stat)
+                except OSError:
+                    continue
+                h.update(f"{path.relative_to(self.work_dir)}\0{digest}\n".encode())
+        return h.hexdigest()
+
+    def _key(self, code_blocks, fingerprint):
+        h = hashlib.sha256(fingerprint.encode())
+        for block in code_blocks:
+            h.update(b"\0" + block.language.lower().encode() + b"\0" + block.code.encode())
+        return h.hexdigest()
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, _, result = entry
+        if time.time() - stored_at > self.max_age:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _put(self, key, result):
+        if key in self._entries:
+            self._drop(key)
+        size = len(result.output.encode())
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.time(), size, result)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.stats["evicted"] += 1
+
+    async def execute_code_blocks(self, code_blocks, cancellation_token: CancellationToken):
+        if not is_cacheable(code_blocks):
+            self.stats["bypassed"] += 1
+            return await self.executor.execute_code_blocks(code_blocks, cancellation_token)
+
+        key = self._key(code_blocks, self._workdir_fingerprint())
+        result = self._get(key)
+        if result is not None:
+            self.stats["hits"] += 1
+            print("⚡ Execution served from cache")
+            return result
+
+        self.stats["misses"] += 1
+        result = await self.executor.execute_code_blocks(code_blocks, cancellation_token)
+        if result.exit_code != TIMEOUT_EXIT_CODE:
+            self._put(key, result)
+        return result
+
+    def clear(self):
+        self._entries.clear()
+        self._file_hashes.clear()
+        self._bytes = 0
+
+    def summary(self):
+        return (f"{self.stats['hits']} cache hits, {self.stats['misses']} misses, "
+                f"{self.stats['bypassed']} uncacheable, {self.stats['evicted']} evicted")
+
+    async def start(self):
+        await self.executor.start()
+
+    async def stop(self):
+        await self.executor.stop()
+
+    async def restart(self):
+        self.clear()
+        await self.executor.restart()
@@ -0,0 +1,305 @@
+"""
+Warm local code executor for CodeExecutorAgent.
+
+Docker pays container startup on every session. This executor instead keeps
+a small pool of Python worker processes that have already started the
+interpreter and imported common modules; each one sits blocked on stdin
+until code arrives. A worker runs exactly one code block and exits, so runs
+never share state, and a replacement is spawned right away in the
+background.
+
+Limits per run: a wall-clock timeout (the process group is killed), POSIX
+rlimits on CPU time, address space and file size (set by the worker itself,
+or by ulimit for shell blocks; Windows gets timeouts only), and a fresh temp
+working directory under coding/.
+
+    executor = WarmPythonExecutor(work_dir="coding")
+    agent = CodeExecutorAgent("Executor", code_executor=executor)
+
+This runs model-written code on the host without container isolation, so
+create_code_executor() only uses it when asked for explicitly
+(CODE_EXECUTOR=local); if Docker was asked for and is unreachable it
+raises instead of falling back.
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeExecutor, CodeResult
+
+PYTHON_LANGUAGES = {"python", "py", "python3"}
+SHELL_LANGUAGES = {"bash", "sh", "shell"}
+
+# Modules the workers import while idle so generated scripts don't pay for them
+DEFAULT_PRELOAD = ("json", "math", "re", "random", "datetime", "collections", "itertools", "statistics")
+
+# Runs inside each worker: preload, apply the rlimits, then block until a workdir
+# line and the code arrive. Limits are set here rather than in a preexec_fn, which
+# isn't safe to use from the threads that spawn workers.
+WORKER_SRC = """
+import os, sys
+for _name in sys.argv[1].split(","):
+    if _name:
+        try:
+            __import__(_name)
+        except Exception:
+            pass
+try:
+    import resource
+    for _limit, _value in zip(("RLIMIT_CPU", "RLIMIT_AS", "RLIMIT_FSIZE"), sys.argv[2].split(",")):
+        if int(_value):
+            resource.setrlimit(getattr(resource, _limit), (int(_value), int(_value)))
+except ImportError:
+    pass
+_workdir = sys.stdin.readline().rstrip("\\n")
+_code = sys.stdin.read()
+os.chdir(_workdir)
+sys.path.insert(0, _workdir)
+sys.argv = ["main.py"]
+_globals = {"__name__": "__main__", "__file__": os.path.join(_workdir, "main.py"), "__builtins__": __builtins__}
+exec(compile(_code, _globals["__file__"], "exec"), _globals)
+"""
+
+TIMEOUT_EXIT_CODE = 124
+
+
+def _process_group_kwargs():
+    """Popen kwargs putting the child in its own process group, so timeouts kill everything it started"""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _close(process):
+    """Reap a finished or killed process and close its pipes"""
+    for stream in (process.stdin, process.stdout):
+        if stream is not None:
+            try:
+                stream.close()
+            except OSError:
+                pass
+    process.wait()
+
+
+class WarmPythonExecutor(CodeExecutor):
+    """CodeExecutor backed by pre-started, single-use Python worker processes"""
+
+    def __init__(self, work_dir="coding", pool_size=2, timeout=60, cpu_seconds=30,
+                 memory_mb=1024, file_mb=50, preload=DEFAULT_PRELOAD, keep_workdirs=False):
+        """
+        Args:
+            work_dir: Parent directory for the per-run temp directories
+            pool_size: Number of idle workers kept ready
+            timeout: Wall-clock seconds per code block
+            cpu_seconds: RLIMIT_CPU per worker (None to disable)
+            memory_mb: RLIMIT_AS per worker in MB (None to disable)
+            file_mb: RLIMIT_FSIZE per worker in MB (None to disable)
+            preload: Modules each worker imports while idle
+            keep_workdirs: Leave each run's temp directory behind for inspection
+        """
+        # Absolute: workers start with cwd=work_dir and then chdir into each run's directory
+        self.work_dir = Path(work_dir).resolve()
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.file_mb = file_mb
+        self.preload = ",".join(preload)
+        self.keep_workdirs = keep_workdirs
+        self._idle = []
+        self._lock = threading.Lock()
+        self._running = False
+
+    def _limits(self):
+        """(cpu seconds, address space bytes, file size bytes); 0 means unlimited"""
+        return (
+            self.cpu_seconds or 0,
+            (self.memory_mb or 0) * 1024 * 1024,
+            (self.file_mb or 0) * 1024 * 1024,
+        )
+
+    def _spawn(self):
+        return subprocess.Popen(
+            [sys.executable, "-u", "-c", WORKER_SRC, self.preload, ",".join(map(str, self._limits()))],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self.work_dir,
+            **_process_group_kwargs(),
+        )
+
+    def _refill(self):
+        with self._lock:
+            missing = self.pool_size - len(self._idle) if self._running else 0
+        for _ in range(missing):
+            worker = self._spawn()
+            with self._lock:
+                if self._running and len(self._idle) < self.pool_size:
+                    self._idle.append(worker)
+                    continue
+            worker.kill()
+            _close(worker)
+
+    def _checkout(self):
+        """An idle worker (spawned on the spot if the pool is empty); refills in the background"""
+        with self._lock:
+            worker = None
+            while self._idle and worker is None:
+                candidate = self._idle.pop(0)
+                if candidate.poll() is None:
+                    worker = candidate
+                else:
+                    _close(candidate)
+        if worker is None:
+            worker = self._spawn()
+        threading.Thread(target=self._refill, daemon=True).start()
+        return worker
+
+    @staticmethod
+    def _kill(process):
+        try:
+            if os.name != "nt":
+                os.killpg(process.pid, 9)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _communicate(self, process, run, payload=None):
+        """Wait for a run's process; it is registered in run so cancellation can kill it"""
+        with self._lock:
+            run["process"] = process
+        if run["cancelled"]:
+            self._kill(process)
+        try:
+            output, _ = process.communicate(payload, timeout=self.timeout)
+            return process.returncode, output.decode(errors="replace")
+        except subprocess.TimeoutExpired:
+            self._kill(process)
+            output, _ = process.communicate()
+            return TIMEOUT_EXIT_CODE, output.decode(errors="replace") + f"\nTimeout: exceeded {self.timeout}s"
+        finally:
+            with self._lock:
+                run["process"] = None
+
+    def _run_python(self, code, run_dir, run):
+        worker = self._checkout()
+        return self._communicate(worker, run, f"{run_dir}\n{code}".encode())
+
+    def _run_shell(self, code, run_dir, run):
+        script = Path(run_dir) / "main.sh"
+        script.write_text(code)
+        # Same limits as the Python workers, via ulimit (bash -v/-f take KiB)
+        cpu, memory, file_size = self._limits()
+        limits = [f"ulimit -{flag} {value} 2>/dev/null"
+                  for flag, value in (("t", cpu), ("v", memory // 1024), ("f", file_size // 1024)) if value]
+        process = subprocess.Popen(
+            ["bash", "-c", "; ".join(limits + ['exec bash "$0"']), str(script)], cwd=run_dir,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **_process_group_kwargs(),
+        )
+        return self._communicate(process, run)
+
+    def _run_blocks(self, code_blocks, run_dir, run):
+        outputs, exit_code = [], 0
+        for block in code_blocks:
+            if run["cancelled"]:
+                break
+            language = block.language.lower()
+            if language in PYTHON_LANGUAGES:
+                (Path(run_dir) / "main.py").write_text(block.code)
+                exit_code, output = self._run_python(block.code, run_dir, run)
+            elif language in SHELL_LANGUAGES:
+                exit_code, output = self._run_shell(block.code, run_dir, run)
+            else:
+                exit_code, output = 1, f"Unsupported language: {block.language}"
+            outputs.append(output)
+            if exit_code != 0:
+                break
+        return exit_code, "".join(outputs)
+
+    def _cancel(self, run):
+        with self._lock:
+            run["cancelled"] = True
+            process = run["process"]
+        if process is not None:
+            self._kill(process)
+
+    async def execute_code_blocks(self, code_blocks, cancellation_token: CancellationToken):
+        """Run the blocks in order in one fresh temp directory; stops at the first failure"""
+        if not self._running:
+            await self.start()
+        run_dir = tempfile.mkdtemp(prefix="run_", dir=self.work_dir)
+        run = {"process": None, "cancelled": False}
+        try:
+            future = asyncio.ensure_future(asyncio.to_thread(self._run_blocks, code_blocks, run_dir, run))
+            cancellation_token.link_future(future)
+            try:
+                exit_code, output = await future
+            except asyncio.CancelledError:
+                # The worker thread can't be cancelled; kill its process so it returns
+                self._cancel(run)
+                raise
+        finally:
+            if not self.keep_workdirs:
+                shutil.rmtree(run_dir, ignore_errors=True)
+        return CodeResult(exit_code=exit_code, output=output)
+
+    async def start(self):
+        """Create the work dir and pre-start the worker pool"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._running = True
+        await asyncio.to_thread(self._refill)
+
+    async def stop(self):
+        """Kill idle workers"""
+        with self._lock:
+            self._running = False
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._kill(worker)
+            _close(worker)
+
+    async def restart(self):
+        await self.stop()
+        await self.start()
+
+
+def create_code_executor(work_dir="coding", kind=None):
+    """Docker executor by default; the unsandboxed warm local one only when asked for
+
+    kind: "docker" or "local"; defaults to the CODE_EXECUTOR environment variable,
+    then "docker".
+
+    Raises:
+        RuntimeError: If Docker was requested but is not available
+        ValueError: For an unknown kind
+    """
+    kind = (kind or os.environ.get("CODE_EXECUTOR", "docker")).lower()
+    work_dir = Path(work_dir).resolve()
+    work_dir.mkdir(parents=True, exist_ok=True)
+    if kind == "local":
+        print("⚠ Warm local executor initialized: generated code runs on this host without a sandbox")
+        return WarmPythonExecutor(work_dir=work_dir)
+    if kind != "docker":
+        raise ValueError(f"Unknown CODE_EXECUTOR {kind!r}; use 'docker' or 'local'")
+    try:
+        import docker
+        from autogen_ext.code_executors.docker import DockerCommandLineCodeExecutor
+
+        # The executor only connects on start(); ping now so a stopped daemon is caught here
+        docker.from_env().ping()
+    except Exception as e:
+        raise RuntimeError(
+            f"Docker is not available ({e}). Start Docker, or set CODE_EXECUTOR=local "
+            f"to run generated code on this host without a sandbox."
+        ) from e
+    executor = DockerCommandLineCodeExecutor(work_dir=work_dir)
+    print("✓ Docker executor initialized")
+    return executor
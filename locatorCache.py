@@ -0,0 +1,107 @@
+"""
+Persistent, self-healing locator store for xpathFinder.
+
+Locators are keyed by a URL pattern (host + path with ids/numbers wildcarded,
+query string dropped) and the normalized element description. Each entry
+keeps the primary XPath followed by its fallbacks, so a repeat run can
+revalidate the cached candidates in one round trip and only go back to the
+model when none of them still match.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Path segments that are most likely ids rather than page structure
+_VARIABLE_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8,}|[A-Z0-9]{10})$", re.IGNORECASE)
+
+
+def url_pattern(url):
+    """amazon.in/gp/product/B0C12345XY?ref=x -> amazon.in/gp/product/*"""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [s for s in parsed.path.split("/") if s]
+    segments = ["*" if _VARIABLE_SEGMENT.match(s) else s for s in segments]
+    return "/".join([host] + segments)
+
+
+def normalize_description(description):
+    return " ".join(description.lower().split())
+
+
+class LocatorStore:
+    """JSON-file backed map of (url pattern, description) -> ranked XPaths"""
+
+    def __init__(self, path="locators.json", max_candidates=5):
+        self.path = path
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._data = json.load(f)
+
+    def _key(self, url, description):
+        return f"{url_pattern(url)} :: {normalize_description(description)}"
+
+    def _save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def lookup(self, url, description):
+        """Cached XPaths for this element, primary first (empty list if unknown)"""
+        entry = self._data.get(self._key(url, description))
+        return list(entry["xpaths"]) if entry else []
+
+    def entries_for(self, url):
+        """All (description, xpaths) stored for the URL's pattern"""
+        prefix = f"{url_pattern(url)} :: "
+        return [(key[len(prefix):], list(entry["xpaths"]))
+                for key, entry in self._data.items() if key.startswith(prefix)]
+
+    def record(self, url, description, results):
+        """Store validated candidates (ranked validation results) as primary + fallbacks"""
+        xpaths = [r["xpath"] for r in results if r["count"] and not r["error"]]
+        if not xpaths:
+            return
+        with self._lock:
+            self._data[self._key(url, description)] = {
+                "xpaths": xpaths[:self.max_candidates],
+                "hits": 0,
+                "updated": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save()
+
+    def promote(self, url, working):
+        """Mark cache hits and save once; a fallback that still works becomes the new primary
+
+        Args:
+            url: Page the locators were revalidated on
+            working: {description: XPath that matched}
+        """
+        with self._lock:
+            changed = False
+            for description, xpath in working.items():
+                entry = self._data.get(self._key(url, description))
+                if not entry:
+                    continue
+                if entry["xpaths"][0] != xpath:
+                    entry["xpaths"].remove(xpath)
+                    entry["xpaths"].insert(0, xpath)
+                    entry["updated"] = datetime.now().isoformat(timespec="seconds")
+                entry["hits"] += 1
+                changed = True
+            if changed:
+                self._save()
+
+    def forget(self, url, description):
+        with self._lock:
+            if self._data.pop(self._key(url, description), None) is not None:
+                self._save()
@@ -0,0 +1,176 @@
+"""
+One place to get model clients for the local Ollama server.
+
+Every entry point used to build its own OpenAIChatCompletionClient or
+config_list (and test1.py opened a separate requests connection for its
+health check). Here sync callers share one keep-alive HTTP connection pool
+per process, async clients share one per event loop (httpx connections are
+bound to the loop that opened them), all use the same timeouts and model
+capability info, and the health check result is cached.
+
+    from modelClients import get_model_client, legacy_llm_config
+
+    model_client = get_model_client()          # autogen_agentchat (0.4+)
+    llm_config = legacy_llm_config()           # pyautogen AssistantAgent/UserProxyAgent
+
+Set OLLAMA_BASE_URL / OLLAMA_MODEL to point somewhere else.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+
+import httpx
+
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
+DEFAULT_MODEL = os.environ.get("OLLAMA_MODEL", "qwen2.5")
+API_KEY = "ollama"  # Ollama doesn't require a real API key
+
+# Local models can take minutes on a long completion; connecting should not
+REQUEST_TIMEOUT = 300.0
+CONNECT_TIMEOUT = 60.0
+TIMEOUT = httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=120)
+
+# Capabilities autogen can't look up for Ollama models
+MODEL_INFO = {
+    "vision": False,
+    "function_calling": True,
+    "json_output": True,
+    "family": "unknown",
+    "structured_output": False,
+}
+
+_lock = threading.Lock()
+# Keyed by event loop: entries go away with the loop they belong to
+_async_http = weakref.WeakKeyDictionary()
+_sync_http = None
+_clients = weakref.WeakKeyDictionary()  # loop -> {(model, kwargs): client}
+_health = {"checked_at": 0.0, "models": None, "error": None}
+
+
+class _SharedHttpClient(httpx.Client):
+    """Sync client that survives pyautogen's deepcopy of llm_config as the same pool"""
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def shared_async_http():
+    """Keep-alive pool for async clients, one per running event loop
+
+    httpx binds connections to the event loop that opened them, so each
+    asyncio.run() gets its own pool. Called outside a running loop, this
+    returns a new, unshared client.
+    """
+    loop = _running_loop()
+    if loop is None:
+        return httpx.AsyncClient(timeout=TIMEOUT, limits=LIMITS)
+    with _lock:
+        client = _async_http.get(loop)
+        if client is None or client.is_closed:
+            client = _async_http[loop] = httpx.AsyncClient(timeout=TIMEOUT, limits=LIMITS)
+        return client
+
+
+def shared_sync_http():
+    """Process-wide keep-alive pool for sync callers (pyautogen, health checks)"""
+    global _sync_http
+    with _lock:
+        if _sync_http is None or _sync_http.is_closed:
+            _sync_http = _SharedHttpClient(timeout=TIMEOUT, limits=LIMITS)
+        return _sync_http
+
+
+def get_model_client(model=DEFAULT_MODEL, **kwargs):
+    """OpenAIChatCompletionClient for the Ollama server, built once per model and event loop
+
+    Extra kwargs (e.g. temperature) produce a separate client that still
+    shares the loop's connection pool.
+    """
+    loop = _running_loop()
+    key = (model, tuple(sorted(kwargs.items())))
+    with _lock:
+        cache = _clients.setdefault(loop, {}) if loop is not None else {}
+    client = cache.get(key)
+    if client is None:
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+        client = OpenAIChatCompletionClient(
+            model=model,
+            api_key=API_KEY,
+            base_url=f"{OLLAMA_BASE_URL}/v1",
+            model_info=MODEL_INFO,
+            timeout=TIMEOUT,
+            http_client=shared_async_http(),
+            **kwargs,
+        )
+        cache[key] = client
+    return client
+
+
+def legacy_config_list(model=DEFAULT_MODEL):
+    """config_list for pyautogen agents, sharing the sync connection pool"""
+    return [{
+        "model": model,
+        "base_url": f"{OLLAMA_BASE_URL}/v1",
+        "api_key": API_KEY,
+        "http_client": shared_sync_http(),
+    }]
+
+
+def legacy_llm_config(model=DEFAULT_MODEL, temperature=0.7, timeout=REQUEST_TIMEOUT):
+    """llm_config for pyautogen agents"""
+    return {
+        "config_list": legacy_config_list(model),
+        "timeout": timeout,
+        "temperature": temperature,
+    }
+
+
+def ollama_models(ttl=60):
+    """Names of the models the server has, cached for ttl seconds
+
+    Raises httpx.HTTPError (or KeyError on an unexpected reply) when the
+    server can't be reached; failures are cached too, so a dead server is
+    only probed once per ttl.
+    """
+    now = time.monotonic()
+    if now - _health["checked_at"] < ttl:
+        if _health["error"] is not None:
+            raise _health["error"]
+        return _health["models"]
+    try:
+        response = shared_sync_http().get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
+        response.raise_for_status()
+        _health.update(models=[m["name"] for m in response.json()["models"]], error=None)
+    except (httpx.HTTPError, KeyError, ValueError) as e:
+        _health.update(models=None, error=e)
+    _health["checked_at"] = now
+    if _health["error"] is not None:
+        raise _health["error"]
+    return _health["models"]
+
+
+def check_ollama(model=DEFAULT_MODEL, ttl=60):
+    """Print the server status; returns False if it can't be reached"""
+    print(f"Testing connection to {OLLAMA_BASE_URL}...")
+    try:
+        models = ollama_models(ttl)
+    except Exception as e:
+        print(f"✗ Connection failed: {e}")
+        print("Make sure Ollama is running: 'ollama serve'")
+        return False
+    print(f"✓ Connected! Available models: {models}")
+    if model not in " ".join(models):
+        print(f"⚠ Warning: {model} not found. Run 'ollama pull {model}' to install it.")
+    return True
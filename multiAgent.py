@@ -1,47 +1,53 @@
 import autogen
-from click import group
-
-from AIOllama import user_proxy
-from app1 import system_message
-
-config_list = [{
-    "model" : "qwen2.5",
-    "base_url" : "http://localhost:11434/v1",
-    "api_key" : "ollama"
-}]
-llm_config = {
-    "config_list" : config_list,
-    "temperature" : 0.7
-}
-
-code = autogen.AssistantAgent(
-    name = "Coder",
-    llm_config=llm_config,
-    system_message = "You are an expert python coder."
-)
-
-reviewer = autogen.AssistantAgent(
-    name = "Reviewer",
-    llm_config=llm_config,
-    system_message="You review code for bugs and improvements."
-)
-
-user_proxy = autogen.UserProxyAgent(
-    name = "Proxy",
-    human_input_mode= "TERMINATE",
-    max_consecutive_auto_reply= 5,
-    code_execution_config = {
-        "work_dir" : "coding",
-        "use_docker" : False
-    },
-)
-
-groupchat = autogen.GroupChat(
-    agents = [user_proxy,code,reviewer],
-    messages = [],
-    max_round= 2
-)
-
-manager = autogen.GroupChatManager(groupchat = groupchat, llm_config=llm_config)
-user_proxy.initiate_chat(manager,
-                         message="Create a function to sort a list using quicksortcd.")
\ No newline at end of file
+
+from AIOllama import build_user_proxy
+from modelClients import legacy_llm_config
+from prompts import PYTHON_CODER_MESSAGE, REVIEWER_MESSAGE
+from speakerSelection import RuleBasedSpeakerSelector
+
+TASK = "Create a function to sort a list using quicksortcd."
+
+
+def build_group_chat(llm_config=None):
+    """Coder/Reviewer/Proxy group chat; returns (user_proxy, manager)"""
+    llm_config = llm_config or legacy_llm_config("qwen2.5", temperature=0.7)
+
+    code = autogen.AssistantAgent(
+        name = "Coder",
+        llm_config=llm_config,
+        system_message = PYTHON_CODER_MESSAGE
+    )
+
+    reviewer = autogen.AssistantAgent(
+        name = "Reviewer",
+        llm_config=llm_config,
+        system_message=REVIEWER_MESSAGE
+    )
+
+    user_proxy = build_user_proxy(
+        name = "Proxy",
+        human_input_mode= "TERMINATE",
+        max_consecutive_auto_reply= 5,
+    )
+
+    # Coder -> Proxy (runs the code) -> Reviewer by rule; the model only picks when the rules can't
+    groupchat = autogen.GroupChat(
+        agents = [user_proxy,code,reviewer],
+        messages = [],
+        max_round= 2,
+        speaker_selection_method = RuleBasedSpeakerSelector(code, executor=user_proxy, reviewer=reviewer),
+    )
+
+    manager = autogen.GroupChatManager(groupchat = groupchat, llm_config=llm_config)
+    return user_proxy, manager
+
+
+def main():
+    user_proxy, manager = build_group_chat()
+    user_proxy.initiate_chat(manager,
+                             message=TASK)
+    print(manager.groupchat.speaker_selection_method.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Offline XPath evaluation against captured HTML (no browser needed).
+
+Capture page_source once (or load a saved .html file) and evaluate XPath
+candidates in-process with lxml. Results have the same shape as
+xpathValidator.validate_xpaths, so SimpleXPathGenerator and the locator
+store work unchanged on snapshots.
+
+Regression run over saved snapshots:
+    python offlineXPath.py snapshots/ --locators locators.json
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+
+from lxml import etree, html
+
+from domDigest import format_digest
+from xpathValidator import robustness_score
+
+# Saved snapshots start with this comment so the original URL survives
+_URL_MARKER = re.compile(r"^<!-- snapshot-url: (.*?) -->")
+
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+_NEVER_VISIBLE = {"head", "script", "style", "template", "noscript", "meta", "link", "title"}
+
+INTERACTIVE = ("//a | //button | //input | //select | //textarea | //summary | //label"
+               " | //*[@role='button' or @role='link' or @role='tab' or @role='menuitem']"
+               " | //*[@onclick] | //*[@contenteditable='true']")
+LANDMARK = ("//header | //nav | //main | //footer | //aside | //form | //h1 | //h2 | //h3"
+            " | //*[@role='navigation' or @role='search' or @role='banner' or @role='main'"
+            " or @role='dialog']")
+
+
+def _clip(text, limit):
+    text = " ".join((text or "").split())
+    return text[:limit] + "…" if len(text) > limit else text
+
+
+def _is_visible(node):
+    """Static approximation of the browser's visibility check"""
+    if not isinstance(node, etree._Element):
+        # text()/@attr results: judge by the element that owns them
+        node = node.getparent() if hasattr(node, "getparent") else None
+        if node is None:
+            return False
+    if node.get("type") == "hidden":
+        return False
+    for el in [node, *node.iterancestors()]:
+        if not isinstance(el.tag, str) or el.tag in _NEVER_VISIBLE:
+            return False
+        if el.get("hidden") is not None or el.get("aria-hidden") == "true":
+            return False
+        if _HIDDEN_STYLE.search(el.get("style", "")):
+            return False
+    return True
+
+
+class OfflinePage:
+    """Parsed HTML snapshot that can evaluate XPaths and build a DOM digest"""
+
+    _compiled = {}  # xpath -> etree.XPath (or the syntax error), shared across pages
+
+    def __init__(self, source, url=""):
+        match = _URL_MARKER.match(source)
+        if match and not url:
+            url = match.group(1)
+        self.source = source
+        self.url = url
+        self.root = html.document_fromstring(source)
+        title = self.root.find(".//title")
+        self.title = title.text_content().strip() if title is not None else ""
+
+    @classmethod
+    def from_file(cls, path, url=""):
+        with open(path, encoding="utf-8") as f:
+            return cls(f.read(), url)
+
+    @classmethod
+    def from_driver(cls, driver):
+        return cls(driver.page_source, driver.current_url)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            if not _URL_MARKER.match(self.source):
+                f.write(f"<!-- snapshot-url: {self.url} -->\n")
+            f.write(self.source)
+
+    def _compile(self, xpath):
+        compiled = self._compiled.get(xpath)
+        if compiled is None:
+            try:
+                compiled = etree.XPath(xpath)
+            except etree.XPathSyntaxError as e:
+                compiled = e
+            self._compiled[xpath] = compiled
+        return compiled
+
+    def _evaluate_one(self, xpath):
+        result = {"xpath": xpath, "count": 0, "visible": 0, "error": None}
+        compiled = self._compile(xpath)
+        if isinstance(compiled, Exception):
+            result["error"] = f"SyntaxError: {compiled}"
+            return result
+        try:
+            nodes = compiled(self.root)
+        except etree.XPathError as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            return result
+        if not isinstance(nodes, list):
+            # document.evaluate would reject a string/number/boolean result the same way
+            result["error"] = "TypeError: XPath does not select nodes"
+            return result
+        result["count"] = len(nodes)
+        result["visible"] = sum(1 for node in nodes[:50] if _is_visible(node))
+        return result
+
+    def evaluate(self, xpaths):
+        """Offline equivalent of xpathValidator.validate_xpaths"""
+        results = []
+        for xpath in dict.fromkeys(xpaths):
+            result = self._evaluate_one(xpath)
+            result["unique"] = result["count"] == 1
+            result["score"] = robustness_score(result)
+            results.append(result)
+        return results
+
+    def elements(self):
+        """Digest records in the same shape DomDigest collects in the browser"""
+        landmarks = set(self.root.xpath(LANDMARK))
+        nodes = [n for n in self.root.xpath(f"{LANDMARK} | {INTERACTIVE}") if _is_visible(n)]
+        records = []
+        for el in nodes:
+            is_landmark = el in landmarks
+            show_text = not is_landmark or el.tag in ("h1", "h2", "h3")
+            records.append({
+                "kind": "landmark" if is_landmark else "interactive",
+                "tag": el.tag,
+                "id": el.get("id", ""),
+                "name": el.get("name", ""),
+                "type": el.get("type", ""),
+                "role": el.get("role", ""),
+                "aria": _clip(el.get("aria-label"), 40),
+                "placeholder": _clip(el.get("placeholder"), 40),
+                "testid": el.get("data-testid", ""),
+                "text": _clip(el.text_content(), 50) if show_text else "",
+                "classes": el.get("class", "").split()[:2],
+            })
+        return records
+
+    def digest(self, max_tokens=1500):
+        return format_digest(self.elements(), max_tokens)
+
+
+def run_regression(snapshot_dir, store):
+    """Evaluate every stored locator against the snapshots of matching pages"""
+    paths = sorted(glob.glob(os.path.join(snapshot_dir, "*.html")))
+    checks = failures = 0
+    started = time.perf_counter()
+
+    for path in paths:
+        page = OfflinePage.from_file(path)
+        print(f"\n📄 {os.path.basename(path)} ({page.url or 'no url'})")
+        for description, xpaths in store.entries_for(page.url):
+            results = page.evaluate(xpaths)
+            checks += len(results)
+            ok = next((r for r in results if r["count"] and not r["error"]), None)
+            if ok:
+                print(f"   ✅ {description}: {ok['xpath']}")
+            else:
+                failures += 1
+                print(f"   ❌ {description}: no stored XPath matches")
+
+    elapsed = time.perf_counter() - started
+    rate = checks / elapsed if elapsed else 0
+    print(f"\n{checks} XPath checks over {len(paths)} snapshot(s) in {elapsed:.3f}s "
+          f"({rate:,.0f}/s), {failures} locator(s) broken")
+    return failures
+
+
+if __name__ == "__main__":
+    from locatorCache import LocatorStore
+
+    parser = argparse.ArgumentParser(description="Check stored locators against saved HTML snapshots")
+    parser.add_argument("snapshot_dir")
+    parser.add_argument("--locators", default="locators.json")
+    args = parser.parse_args()
+
+    raise SystemExit(1 if run_regression(args.snapshot_dir, LocatorStore(args.locators)) else 0)
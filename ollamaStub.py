@@ -0,0 +1,377 @@
+"""
+Local stand-in for an Ollama server, for reproducible agent benchmarks.
+
+Implements the endpoints the scripts here use:
+
+    GET  /api/tags              model list (health checks)
+    POST /api/chat              ollama-python chat (tools, format, streaming NDJSON)
+    POST /api/generate          LangChain's Ollama LLM (streaming NDJSON)
+    POST /v1/chat/completions   OpenAI-compatible (autogen, pyautogen; SSE streaming)
+
+Replies come from a StubScript: regex rules on the last message, then a
+scripted sequence, then a default. A script file is JSONL, one reply per
+line, either a string or {"match": regex, "content": ..., "tool_calls":
+[{"name", "arguments"}]} -- e.g. replies recorded from a real session.
+
+Latency is simulated as time-to-first-token plus a fixed delay per token
+(a token is one whitespace-delimited word here); stats record how much of
+each request's time was simulated model time.
+
+    with OllamaStub(StubScript(["Hello!"]), ttft=0.1, token_latency=0.01) as stub:
+        os.environ["OLLAMA_HOST"] = os.environ["OLLAMA_BASE_URL"] = stub.url
+        ...
+
+    python ollamaStub.py --port 11435 --script replies.jsonl --ttft 0.2 --token-latency 0.02
+"""
+
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tokenBudget import estimate_tokens
+
+DEFAULT_MODELS = ("qwen2.5:latest", "llama3:latest", "llama2:latest")
+DEFAULT_REPLY = "This is a scripted reply from the Ollama stub."
+
+_TOKEN = re.compile(r"\s*\S+\s*|\s+")
+
+
+def _reply(value):
+    """Normalize a script entry to {"content", "tool_calls"}"""
+    if isinstance(value, str):
+        return {"content": value, "tool_calls": []}
+    return {"content": value.get("content", ""), "tool_calls": value.get("tool_calls") or []}
+
+
+def _text(content):
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return "" if content is None else str(content)
+
+
+class StubScript:
+    """Chooses the reply for each request"""
+
+    def __init__(self, replies=None, rules=None, default=DEFAULT_REPLY, cycle=True):
+        """
+        Args:
+            replies: Replies served in order (str or {"content", "tool_calls"})
+            rules: [(regex, reply)] checked first against the last message
+            default: Reply when nothing else applies
+            cycle: Restart the sequence when it runs out (otherwise repeat the default)
+        """
+        self.replies = [_reply(r) for r in replies or []]
+        self.rules = [(re.compile(pattern), _reply(reply)) for pattern, reply in rules or []]
+        self.default = _reply(default)
+        self.cycle = cycle
+        self._index = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        replies, rules = [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if isinstance(entry, dict) and entry.get("match"):
+                    rules.append((entry["match"], entry))
+                else:
+                    replies.append(entry)
+        return cls(replies, rules, **kwargs)
+
+    def next(self, last_message=""):
+        for pattern, reply in self.rules:
+            if pattern.search(last_message):
+                return reply
+        with self._lock:
+            if self._index < len(self.replies):
+                reply = self.replies[self._index]
+                self._index += 1
+                if self.cycle and self._index == len(self.replies):
+                    self._index = 0
+                return reply
+        return self.default
+
+    def reset(self):
+        with self._lock:
+            self._index = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- plumbing -------------------------------------------------------
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _chunk(self, data):
+        data = data.encode() if isinstance(data, str) else data
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    # --- shared generation ----------------------------------------------
+
+    def _generate(self, endpoint, prompt_text, last_message):
+        """Pick the reply and split it into tokens; returns (reply, tokens, prompt_tokens)"""
+        stub = self.server.stub
+        reply = stub.script.next(last_message)
+        tokens = _TOKEN.findall(reply["content"]) or [""]
+        prompt_tokens = estimate_tokens(prompt_text)
+        stub.record(endpoint, len(tokens), prompt_tokens)
+        return reply, tokens, prompt_tokens
+
+    def _tokens_with_latency(self, tokens):
+        stub = self.server.stub
+        time.sleep(stub.ttft)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(stub.token_latency)
+            yield token
+
+    def _wait_whole(self, tokens):
+        stub = self.server.stub
+        time.sleep(stub.ttft + stub.token_latency * max(len(tokens) - 1, 0))
+
+    # --- endpoints --------------------------------------------------------
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            self.server.stub.record("/api/tags")
+            models = [{"name": name, "model": name, "size": 0, "digest": "stub"} for name in self.server.stub.models]
+            return self._send_json({"models": models})
+        if self.path.rstrip("/") in ("/v1/models", "/api/version", ""):
+            return self._send_json({"version": "stub", "data": [{"id": m} for m in self.server.stub.models]})
+        self._send_json({"error": f"not found: {self.path}"}, 404)
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        try:
+            request = self._read_json()
+        except ValueError:
+            return self._send_json({"error": "invalid JSON"}, 400)
+        if path == "/api/chat":
+            return self._ollama_chat(request)
+        if path == "/api/generate":
+            return self._ollama_generate(request)
+        if path == "/v1/chat/completions":
+            return self._openai_chat(request)
+        self._send_json({"error": f"not found: {self.path}"}, 404)
+
+    def _ollama_chat(self, request):
+        model = request.get("model", "stub")
+        messages = request.get("messages") or [{}]
+        prompt = "\n".join(_text(m.get("content")) for m in messages)
+        reply, tokens, prompt_tokens = self._generate("/api/chat", prompt, _text(messages[-1].get("content")))
+        tool_calls = [{"function": {"name": c["name"], "arguments": c.get("arguments", {})}}
+                      for c in reply["tool_calls"]]
+        created = datetime.now(timezone.utc).isoformat()
+        final = {
+            "model": model, "created_at": created, "done": True, "done_reason": "stop",
+            "prompt_eval_count": prompt_tokens, "eval_count": len(tokens),
+        }
+
+        if not request.get("stream", True):
+            self._wait_whole(tokens)
+            message = {"role": "assistant", "content": reply["content"]}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return self._send_json(dict(final, message=message))
+
+        self._start_stream("application/x-ndjson")
+        try:
+            for token in self._tokens_with_latency(tokens):
+                chunk = {"model": model, "created_at": created, "done": False,
+                         "message": {"role": "assistant", "content": token}}
+                self._chunk(json.dumps(chunk) + "\n")
+            message = {"role": "assistant", "content": ""}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            self._chunk(json.dumps(dict(final, message=message)) + "\n")
+            self._end_stream()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading early (e.g. the browser agent's incremental parser)
+            self.close_connection = True
+
+    def _ollama_generate(self, request):
+        model = request.get("model", "stub")
+        prompt = request.get("prompt", "")
+        reply, tokens, prompt_tokens = self._generate("/api/generate", prompt, prompt)
+        created = datetime.now(timezone.utc).isoformat()
+        final = {"model": model, "created_at": created, "response": "", "done": True, "done_reason": "stop",
+                 "prompt_eval_count": prompt_tokens, "eval_count": len(tokens)}
+
+        if not request.get("stream", True):
+            self._wait_whole(tokens)
+            return self._send_json(dict(final, response=reply["content"]))
+
+        self._start_stream("application/x-ndjson")
+        try:
+            for token in self._tokens_with_latency(tokens):
+                self._chunk(json.dumps({"model": model, "created_at": created, "response": token, "done": False}) + "\n")
+            self._chunk(json.dumps(final) + "\n")
+            self._end_stream()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _openai_chat(self, request):
+        model = request.get("model", "stub")
+        messages = request.get("messages") or [{}]
+        prompt = "\n".join(_text(m.get("content")) for m in messages)
+        reply, tokens, prompt_tokens = self._generate("/v1/chat/completions", prompt, _text(messages[-1].get("content")))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        tool_calls = [
+            {"id": f"call_{uuid.uuid4().hex[:8]}", "type": "function",
+             "function": {"name": c["name"], "arguments": json.dumps(c.get("arguments", {}))}}
+            for c in reply["tool_calls"]
+        ]
+        finish_reason = "tool_calls" if tool_calls else "stop"
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                 "total_tokens": prompt_tokens + len(tokens)}
+
+        if not request.get("stream"):
+            self._wait_whole(tokens)
+            message = {"role": "assistant", "content": reply["content"] or None}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return self._send_json({
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                "usage": usage,
+            })
+
+        def event(delta, finish=None, **extra):
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [{"index": 0, "delta": delta, "finish_reason": finish}], **extra}
+            self._chunk(f"data: {json.dumps(payload)}\n\n")
+
+        self._start_stream("text/event-stream")
+        try:
+            first = True
+            for token in self._tokens_with_latency(tokens):
+                event({"role": "assistant", "content": token} if first else {"content": token})
+                first = False
+            if tool_calls:
+                event({"tool_calls": [dict(call, index=i) for i, call in enumerate(tool_calls)]})
+            event({}, finish_reason)
+            if (request.get("stream_options") or {}).get("include_usage"):
+                self._chunk("data: " + json.dumps({
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                    "model": model, "choices": [], "usage": usage,
+                }) + "\n\n")
+            self._chunk("data: [DONE]\n\n")
+            self._end_stream()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class OllamaStub:
+    """Threaded stub server; use as a context manager or start()/stop()"""
+
+    def __init__(self, script=None, host="127.0.0.1", port=0, ttft=0.0, token_latency=0.0, models=DEFAULT_MODELS):
+        """
+        Args:
+            script: StubScript deciding the replies (default reply only if None)
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            ttft: Seconds before the first token of every reply
+            token_latency: Seconds between tokens
+            models: Names reported by /api/tags
+        """
+        self.script = script or StubScript()
+        self.ttft = ttft
+        self.token_latency = token_latency
+        self.models = list(models)
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, endpoint, completion_tokens=0, prompt_tokens=0):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats[endpoint] += 1
+            if completion_tokens:
+                self.stats["completion_tokens"] += completion_tokens
+                self.stats["prompt_tokens"] += prompt_tokens
+                self.stats["simulated_seconds"] += self.ttft + self.token_latency * max(completion_tokens - 1, 0)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = Counter()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="ollama-stub")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ollama / OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--script", help="JSONL file of replies / {match, content, tool_calls} rules")
+    parser.add_argument("--reply", default=DEFAULT_REPLY, help="Default reply text")
+    parser.add_argument("--ttft", type=float, default=0.0, help="Seconds to first token")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per token")
+    args = parser.parse_args()
+
+    script = StubScript.from_file(args.script, default=args.reply) if args.script else StubScript(default=args.reply)
+    stub = OllamaStub(script, args.host, args.port, args.ttft, args.token_latency)
+    print(f"🧪 Ollama stub listening on {stub.url} (set OLLAMA_HOST / OLLAMA_BASE_URL to it)")
+    try:
+        stub.start()._thread.join()
+    except KeyboardInterrupt:
+        stub.stop()
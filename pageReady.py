@@ -0,0 +1,138 @@
+"""
+Event-driven page readiness for the Selenium agents.
+
+Instead of sleeping a fixed time after every action, wait until:
+  1. document.readyState is "complete"
+  2. the DOM has stopped mutating for a short quiet window
+  3. no fetch/XHR requests are in flight, or only a couple (long polls,
+     analytics) that have stayed outstanding for a short grace period
+Beacon-style fetches (keepalive) are not counted. Each action type gets its
+own timeout. A page that never settles is treated as ready once the timeout
+expires, so slow pages degrade to "best effort" rather than failing.
+"""
+
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Seconds to wait for readiness after each kind of action
+ACTION_TIMEOUTS = {
+    "navigate": 15,
+    "search": 10,
+    "click": 8,
+    "default": 10,
+}
+
+# Installed at document start (via CDP) so requests made during load are counted
+TRACKER_JS = """
+(function () {
+  if (window.__pageReady) { return; }
+  var state = window.__pageReady = {pending: 0, lastMutation: Date.now()};
+  var done = function () { state.pending = Math.max(0, state.pending - 1); };
+
+  if (window.fetch) {
+    var origFetch = window.fetch;
+    window.fetch = function (input, init) {
+      // keepalive fetches are beacons: nothing on the page waits for them
+      var beacon = (init && init.keepalive) || (input && input.keepalive);
+      if (beacon) { return origFetch.apply(this, arguments); }
+      state.pending++;
+      var p = origFetch.apply(this, arguments);
+      p.then(done, done);
+      return p;
+    };
+  }
+
+  var origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    state.pending++;
+    this.addEventListener('loadend', done, {once: true});
+    return origSend.apply(this, arguments);
+  };
+
+  new MutationObserver(function () { state.lastMutation = Date.now(); })
+    .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+STATUS_JS = """
+var s = window.__pageReady;
+return {
+  readyState: document.readyState,
+  tracked: !!s,
+  pending: s ? s.pending : 0,
+  quietFor: s ? Date.now() - s.lastMutation : 0
+};
+"""
+
+
+def install_tracker(driver):
+    """Register the readiness tracker for every new document (once per driver)"""
+    if getattr(driver, "_page_ready_tracker", False):
+        return
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": TRACKER_JS})
+    except (AttributeError, WebDriverException):
+        # Not a Chromium driver; fall back to injecting into each page as we see it
+        pass
+    driver._page_ready_tracker = True
+
+
+class _PageReady:
+    """WebDriverWait condition: loaded, DOM quiet and network idle"""
+
+    def __init__(self, quiet_ms, max_inflight, inflight_grace_ms):
+        self.quiet_ms = quiet_ms
+        self.max_inflight = max_inflight
+        self.inflight_grace_ms = inflight_grace_ms
+        self.last_status = None
+        self._tolerated_since = None
+
+    def __call__(self, driver):
+        status = driver.execute_script(STATUS_JS)
+        self.last_status = status
+        if status["readyState"] != "complete":
+            return False
+        if not status["tracked"]:
+            # Page loaded before the tracker existed (or non-CDP driver)
+            driver.execute_script(TRACKER_JS)
+            return False
+        if status["quietFor"] < self.quiet_ms or status["pending"] > self.max_inflight:
+            self._tolerated_since = None
+            return False
+        if status["pending"] == 0:
+            return True
+        # A few requests still open (long poll, analytics): ready once that has held for the grace period
+        now = time.monotonic()
+        if self._tolerated_since is None:
+            self._tolerated_since = now
+        return (now - self._tolerated_since) * 1000 >= self.inflight_grace_ms
+
+
+def wait_for_page_ready(driver, action="default", timeout=None, quiet_ms=250, max_inflight=2,
+                        inflight_grace_ms=500):
+    """Block until the current page is ready for the next action
+
+    Args:
+        driver: Selenium WebDriver
+        action: Key into ACTION_TIMEOUTS ("navigate", "search", "click", ...)
+        timeout: Override the per-action timeout in seconds
+        quiet_ms: How long the DOM must be mutation-free
+        max_inflight: Outstanding fetch/XHR requests tolerated (long polls, analytics)
+        inflight_grace_ms: How long up to max_inflight requests may stay open before
+            the page counts as ready anyway; with none open it is ready immediately
+
+    Returns True if the page settled, False if the timeout expired first.
+    """
+    if timeout is None:
+        timeout = ACTION_TIMEOUTS.get(action, ACTION_TIMEOUTS["default"])
+
+    condition = _PageReady(quiet_ms, max_inflight, inflight_grace_ms)
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1,
+                      ignored_exceptions=(WebDriverException,)).until(condition)
+        return True
+    except TimeoutException:
+        print(f"⚠ Page not fully settled after {timeout}s ({action}): {condition.last_status}")
+        return False
@@ -0,0 +1,98 @@
+"""
+Chunked, relevance-ranked page text extraction.
+
+Visible text blocks are computed inside the browser, ranked against the
+user's request with BM25 (also in the browser, so only the selected text
+crosses the WebDriver connection), and returned within a token budget.
+The ranked blocks stay cached on the page; a continuation offset fetches
+the next chunk without recomputing anything.
+"""
+
+from tokenBudget import CHARS_PER_TOKEN
+
+EXTRACT_JS = """
+var query = arguments[0] || '', offset = arguments[1] || 0, budget = arguments[2];
+var cache = window.__textChunks;
+
+if (offset === 0 || !cache || cache.query !== query) {
+  var BLOCK = 'h1,h2,h3,h4,h5,h6,p,li,td,th,dd,dt,blockquote,pre,figcaption,caption,' +
+              'summary,label,button,div,section,article,main,body';
+  var SKIP = {SCRIPT: 1, STYLE: 1, NOSCRIPT: 1, TEMPLATE: 1, SVG: 1};
+  var owners = new Map(), visible = new Map();
+  var isVisible = function (el) {
+    if (!visible.has(el)) {
+      var cs = window.getComputedStyle(el);
+      visible.set(el, el.getClientRects().length > 0 && cs.visibility !== 'hidden');
+    }
+    return visible.get(el);
+  };
+  var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+  for (var node = walker.nextNode(); node; node = walker.nextNode()) {
+    var parent = node.parentElement;
+    if (!parent || SKIP[parent.tagName] || !node.nodeValue.trim()) { continue; }
+    var owner = parent.closest(BLOCK);
+    if (!owner || !isVisible(parent)) { continue; }
+    if (!owners.has(owner)) { owners.set(owner, []); }
+    owners.get(owner).push(node.nodeValue);
+  }
+
+  var tokenize = function (s) { return s.toLowerCase().match(/[\\p{L}\\p{N}]+/gu) || []; };
+  var seen = new Set(), blocks = [];
+  owners.forEach(function (parts) {
+    var text = parts.join(' ').replace(/\\s+/g, ' ').trim();
+    if (text.length < 2 || seen.has(text)) { return; }
+    seen.add(text);
+    blocks.push({index: blocks.length, text: text, terms: tokenize(text), score: 0});
+  });
+
+  // BM25 against the query; with no query, blocks keep document order
+  var qterms = Array.from(new Set(tokenize(query)));
+  if (qterms.length) {
+    var k1 = 1.2, b = 0.75, df = {}, total = 0;
+    blocks.forEach(function (blk) {
+      total += blk.terms.length;
+      new Set(blk.terms).forEach(function (t) { df[t] = (df[t] || 0) + 1; });
+    });
+    var avg = total / Math.max(blocks.length, 1), n = blocks.length;
+    blocks.forEach(function (blk) {
+      var tf = {};
+      blk.terms.forEach(function (t) { tf[t] = (tf[t] || 0) + 1; });
+      qterms.forEach(function (t) {
+        if (!tf[t]) { return; }
+        var idf = Math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5));
+        blk.score += idf * tf[t] * (k1 + 1) / (tf[t] + k1 * (1 - b + b * blk.terms.length / avg));
+      });
+    });
+    blocks.sort(function (x, y) { return y.score - x.score || x.index - y.index; });
+  }
+  cache = window.__textChunks = {query: query, blocks: blocks};
+}
+
+var picked = [], used = 0, i = offset;
+for (; i < cache.blocks.length; i++) {
+  var blk = cache.blocks[i];
+  var text = blk.text.length > budget ? blk.text.slice(0, budget) + '…' : blk.text;
+  if (picked.length && used + text.length + 1 > budget) { break; }
+  picked.push({index: blk.index, text: text, score: blk.score});
+  used += text.length + 1;
+}
+// Present the chunk in reading order
+picked.sort(function (x, y) { return x.index - y.index; });
+return {
+  blocks: picked,
+  next: i < cache.blocks.length ? i : null,
+  total: cache.blocks.length
+};
+"""
+
+
+def extract_page_text(driver, query="", max_tokens=400, offset=0):
+    """Top-ranked visible text for the query, within max_tokens
+
+    Returns {"text", "blocks", "next", "total"}; pass "next" back as
+    offset (with the same query) to read the following chunk. "next" is
+    None once the page is exhausted.
+    """
+    result = driver.execute_script(EXTRACT_JS, query, offset, max_tokens * CHARS_PER_TOKEN)
+    result["text"] = "\n".join(block["text"] for block in result["blocks"])
+    return result
@@ -0,0 +1,172 @@
+"""
+Asynchronous, compressed screenshots for the browser agents.
+
+Capture goes through CDP (Page.captureScreenshot) on the caller's thread,
+which only costs the browser round trip. Decoding, JPEG/WebP/PNG encoding,
+duplicate detection and the disk write all happen on a background worker,
+so the agent loop never blocks on image processing or file I/O.
+
+A frame is only treated as a duplicate when its pixels (or, without Pillow,
+its bytes) are identical to a recent one; it is then copied instead of
+re-encoded. Near matches are not merged: on text-heavy pages two frames
+that differ by a single price or status line are different screenshots.
+
+Pillow is optional: without it the browser encodes the image directly.
+Errors from the worker are raised by flush().
+"""
+
+import base64
+import hashlib
+import io
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+_FORMATS = {".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp", ".png": "png"}
+_PIL_FORMATS = {"jpeg": "JPEG", "webp": "WEBP", "png": "PNG"}
+
+ELEMENT_RECT_JS = """
+var r = arguments[0].getBoundingClientRect();
+return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+"""
+
+
+def frame_hash(raw, image=None):
+    """Exact content hash: decoded pixels when Pillow is available, else the encoded bytes"""
+    if image is None:
+        return hashlib.sha1(raw).hexdigest()
+    digest = hashlib.sha1(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class ScreenshotWorker:
+    """Capture via CDP now, encode/dedupe/write later on a worker thread"""
+
+    def __init__(self, default_format="jpeg", quality=80, history=20):
+        self.default_format = default_format
+        self.quality = quality
+        self.history = history
+        self._recent = []  # [(hash, filename)] of recently written frames (worker thread only)
+        self._pending = set()
+        self._errors = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+
+    def _target(self, filename):
+        root, ext = os.path.splitext(filename)
+        fmt = _FORMATS.get(ext.lower())
+        if fmt is None:
+            fmt = self.default_format
+            filename = f"{filename}.{'jpg' if fmt == 'jpeg' else fmt}"
+        return filename, fmt
+
+    def _clip(self, driver, element=None, full_page=False):
+        if element is not None:
+            rect = driver.execute_script(ELEMENT_RECT_JS, element)
+            return dict(rect, scale=1)
+        if full_page:
+            size = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})["cssContentSize"]
+            return {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1}
+        return None
+
+    def capture(self, driver, filename, element=None, full_page=False):
+        """Grab the frame and queue it for encoding; returns a Future of the result message
+
+        Args:
+            driver: Chrome WebDriver
+            filename: Output path; its extension picks JPEG/WebP/PNG
+            element: Optional WebElement to crop to
+            full_page: Capture beyond the viewport (ignored for element crops)
+        """
+        filename, fmt = self._target(filename)
+        params = {"format": "png"}
+        if Image is None and fmt != "png":
+            # No Pillow: let the browser compress instead
+            params = {"format": fmt, "quality": self.quality}
+
+        clip = self._clip(driver, element, full_page)
+        if clip is not None:
+            params["clip"] = clip
+            params["captureBeyondViewport"] = True
+
+        data = driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+        future = self._executor.submit(self._process, data, filename, fmt)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            if not future.cancelled() and future.exception() is not None:
+                self._errors.append(future.exception())
+
+    def _duplicate_of(self, digest, filename):
+        for previous_hash, previous_file in self._recent:
+            if previous_hash == digest and os.path.splitext(previous_file)[1] == os.path.splitext(filename)[1]:
+                return previous_file
+        return None
+
+    def _remember(self, digest, filename):
+        # filename now holds new content: forget whatever it held before
+        self._recent = [(h, f) for h, f in self._recent if os.path.abspath(f) != os.path.abspath(filename)]
+        self._recent.insert(0, (digest, filename))
+        del self._recent[self.history:]
+
+    def _process(self, data, filename, fmt):
+        raw = base64.b64decode(data)
+
+        image = Image.open(io.BytesIO(raw)) if Image is not None else None
+        digest = frame_hash(raw, image)
+
+        duplicate = self._duplicate_of(digest, filename)
+        if duplicate and os.path.abspath(duplicate) == os.path.abspath(filename) and os.path.exists(filename):
+            return f"Screenshot unchanged; kept {filename}"
+
+        # Never write through an existing path: it may be a hard link left by an older version
+        if os.path.lexists(filename):
+            os.remove(filename)
+
+        if duplicate:
+            # Same frame again: copy the existing file instead of re-encoding it
+            shutil.copyfile(duplicate, filename)
+            self._remember(digest, filename)
+            return f"Screenshot identical to {duplicate}; copied as {filename}"
+
+        if image is not None:
+            if fmt == "jpeg" and image.mode != "RGB":
+                image = image.convert("RGB")
+            options = {"optimize": True} if fmt == "png" else {"quality": self.quality}
+            image.save(filename, _PIL_FORMATS[fmt], **options)
+        else:
+            with open(filename, "wb") as f:
+                f.write(raw)
+
+        self._remember(digest, filename)
+        return f"Screenshot saved as {filename}"
+
+    def flush(self, timeout=None):
+        """Wait for queued screenshots to be written
+
+        Raises:
+            RuntimeError: If any screenshot failed since the last flush
+        """
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending, timeout=timeout)
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            details = "; ".join(f"{type(e).__name__}: {e}" for e in errors)
+            raise RuntimeError(f"{len(errors)} screenshot(s) failed: {details}")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
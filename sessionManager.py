@@ -0,0 +1,73 @@
+"""
+Concurrent browser sessions for the browser agent.
+
+A single WebDriver session only runs one command at a time, so tabs inside
+one driver cannot make progress in parallel. The session manager instead
+checks several drivers out of a WebDriverPool and drives each from its own
+worker thread, scheduled with asyncio under a concurrency cap. Every
+session runs an ordered plan of actions; the results are gathered back in
+input order.
+"""
+
+import asyncio
+import time
+
+from driverPool import get_pool
+
+
+class BrowserSessionManager:
+    """Run action plans in parallel browser sessions"""
+
+    def __init__(self, worker_factory, pool=None, max_concurrency=3):
+        """
+        Args:
+            worker_factory: Callable(driver) -> object with run_plan(steps) -> str
+            pool: WebDriverPool to check drivers out of (shared headless pool by default)
+            max_concurrency: Maximum number of sessions running at once
+        """
+        self.worker_factory = worker_factory
+        self.pool = pool if pool is not None else get_pool(size=max_concurrency)
+        self.max_concurrency = max_concurrency
+
+    def _run_blocking(self, steps):
+        driver = self.pool.acquire()
+        try:
+            worker = self.worker_factory(driver)
+            return worker.run_plan(steps)
+        finally:
+            self.pool.release(driver)
+
+    async def _run_session(self, index, steps, semaphore):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                observation = await asyncio.to_thread(self._run_blocking, steps)
+                ok = True
+            except Exception as e:
+                observation, ok = f"Session failed: {str(e)}", False
+            return {
+                "session": index,
+                "ok": ok,
+                "observation": observation,
+                "seconds": time.perf_counter() - started,
+            }
+
+    async def run(self, plans):
+        """Run every plan in its own session; results come back in input order"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self._run_session(i, steps, semaphore) for i, steps in enumerate(plans, 1))
+        )
+
+    def run_sync(self, plans):
+        """Blocking wrapper for callers outside an event loop"""
+        return asyncio.run(self.run(plans))
+
+
+def format_results(results):
+    """Merge per-session results into one observation for the model"""
+    lines = []
+    for result in results:
+        lines.append(f"--- Session {result['session']} ({result['seconds']:.1f}s) ---")
+        lines.append(result["observation"])
+    return "\n".join(lines)
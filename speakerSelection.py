@@ -0,0 +1,110 @@
+"""
+Rule-based speaker selection for the Coder/Reviewer/Proxy group chat.
+
+With speaker_selection_method="auto" the GroupChatManager asks the model
+who speaks next on every round. For a fixed trio the answer is almost
+always determined by the last message:
+
+    task / review asks for changes  -> Coder
+    Coder sent a code block         -> executor (the proxy runs it)
+    execution failed                -> Coder again (up to max_retries)
+    execution succeeded             -> Reviewer
+    Reviewer replied LGTM/TERMINATE -> executor (the proxy ends the chat)
+
+Anything the rules don't cover falls back to "auto", so the model is only
+asked when the conversation goes off script. Approval has to be explicit:
+prose like "looks good, but..." or "not approved" is sent back to the Coder.
+
+    selector = RuleBasedSpeakerSelector(coder, executor=user_proxy, reviewer=reviewer)
+    groupchat = autogen.GroupChat(agents, messages=[], speaker_selection_method=selector)
+"""
+
+import re
+from collections import Counter
+
+_CODE_BLOCK = re.compile(r"```[ \t]*(\w+)?\s*\n.*?```", re.DOTALL)
+_EXIT_CODE = re.compile(r"exitcode:\s*(-?\d+)")
+_ERROR_OUTPUT = re.compile(r"Traceback \(most recent call last\)|\b\w+Error:|\bexecution failed\b")
+# Explicit sign-off tokens only (REVIEWER_MESSAGE asks for them); case-sensitive so prose doesn't match
+_APPROVAL = re.compile(r"\b(LGTM|TERMINATE)\b")
+# "not LGTM", "don't TERMINATE yet", "LGTM, but ..." are not approvals
+_NEGATED = re.compile(r"\b(not|no|never|cannot)\W+(\w+\W+)?$|n't\W+(\w+\W+)?$", re.IGNORECASE)
+_QUALIFIED = re.compile(r"^\W*(but|however|except|once|after|if|until)\b", re.IGNORECASE)
+
+
+def _approves(text):
+    """True if some LGTM/TERMINATE in the text is neither negated nor followed by a condition"""
+    for match in _APPROVAL.finditer(text):
+        clause = re.split(r"[.!?;\n]", text[:match.start()])[-1]
+        if not (_NEGATED.search(clause) or _QUALIFIED.match(text[match.end():])):
+            return True
+    return False
+
+
+def _content(message):
+    content = message.get("content") if isinstance(message, dict) else message
+    return content if isinstance(content, str) else ""
+
+
+class RuleBasedSpeakerSelector:
+    """Callable for GroupChat(speaker_selection_method=...) that only falls back to the LLM when needed"""
+
+    def __init__(self, coder, executor, reviewer, max_retries=2, fallback="auto"):
+        """
+        Args:
+            coder: Agent that writes code
+            executor: Agent that executes code blocks (the user proxy)
+            reviewer: Agent that reviews working code
+            max_retries: Failed executions sent back to the coder before deferring to the fallback
+            fallback: Selection method used when no rule applies
+        """
+        self.coder = coder
+        self.executor = executor
+        self.reviewer = reviewer
+        self.max_retries = max_retries
+        self.fallback = fallback
+        self.retries = 0
+        self.stats = Counter()
+
+    def _after_executor(self, text):
+        """The proxy spoke: either the task/human input or an execution result"""
+        match = _EXIT_CODE.search(text)
+        if match is None:
+            return self.coder
+        if int(match.group(1)) != 0 or _ERROR_OUTPUT.search(text):
+            if self.retries >= self.max_retries:
+                return None
+            self.retries += 1
+            self.stats["retries"] += 1
+            return self.coder
+        self.retries = 0
+        return self.reviewer
+
+    def _select(self, last_speaker, text):
+        if last_speaker is self.executor:
+            return self._after_executor(text)
+        if last_speaker is self.coder:
+            return self.executor if _CODE_BLOCK.search(text) else None
+        if last_speaker is self.reviewer:
+            return self.executor if _approves(text) else self.coder
+        return None
+
+    def __call__(self, last_speaker, groupchat):
+        text = _content(groupchat.messages[-1]) if groupchat.messages else ""
+        selected = self._select(last_speaker, text)
+        if selected is None:
+            self.stats["fallback"] += 1
+            return self.fallback
+        self.stats["rule"] += 1
+        return selected
+
+    @property
+    def model_calls_saved(self):
+        """Each rule-based pick replaces one speaker-selection model call"""
+        return self.stats["rule"]
+
+    def summary(self):
+        total = self.stats["rule"] + self.stats["fallback"]
+        return (f"Speaker selection: {total} rounds, {self.stats['rule']} by rule "
+                f"({self.model_calls_saved} model calls saved), {self.stats['fallback']} via {self.fallback}, "
+                f"{self.stats['retries']} retries after failed runs")
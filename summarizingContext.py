@@ -0,0 +1,188 @@
+"""
+Bounded, summarizing model context for the coding assistant.
+
+In a fix loop every turn used to resend the whole history: each failed
+attempt's code plus its full traceback and stdout. This context keeps what
+the model needs to make the next fix and compresses the rest:
+
+- the task (first user message) and the latest code verbatim
+- the most recent messages, with tracebacks cut down to the last frames and
+  the exception, and long output cut to its head and tail
+- everything older folded into one extractive summary message (one line
+  per turn: what was tried and how it failed)
+- a hard token budget on top of that, enforced by dropping the oldest
+  summary lines first and recent turns after that
+
+The system message is not part of the model context (AssistantAgent adds
+it separately), so it is always sent.
+
+    assistant = AssistantAgent(..., model_context=SummarizingChatContext(max_tokens=3000))
+"""
+
+import re
+
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import AssistantMessage, FunctionExecutionResultMessage, UserMessage
+
+from tokenBudget import CHARS_PER_TOKEN, estimate_tokens
+
+_CODE_BLOCK = re.compile(r"```[^\n]*\n(.*?)```", re.DOTALL)
+_TRACEBACK_HEADER = "Traceback (most recent call last):"
+_FRAME = re.compile(r'^\s*File ".*", line \d+')
+_EXCEPTION_LINE = re.compile(r"^\w+(\.\w+)*(Error|Exception|Exit|Interrupt|Warning)\b.*")
+
+
+def trim_traceback(text, keep_frames=2):
+    """Keep the header, the last keep_frames frames and the exception of each traceback"""
+    if _TRACEBACK_HEADER not in text:
+        return text
+    lines = text.splitlines()
+    out, i = [], 0
+    while i < len(lines):
+        if lines[i].strip() != _TRACEBACK_HEADER:
+            out.append(lines[i])
+            i += 1
+            continue
+        # Collect frames (a "File ..." line plus its indented source lines) until the exception line
+        frames, i = [], i + 1
+        while i < len(lines) and (lines[i].startswith((" ", "\t")) or not lines[i].strip()):
+            if _FRAME.match(lines[i]):
+                frames.append([lines[i]])
+            elif frames:
+                frames[-1].append(lines[i])
+            i += 1
+        out.append(_TRACEBACK_HEADER)
+        if len(frames) > keep_frames:
+            out.append(f"  ... {len(frames) - keep_frames} earlier frames omitted ...")
+        for frame in frames[-keep_frames:]:
+            out.extend(frame)
+    return "\n".join(out)
+
+
+def truncate_output(text, max_chars=1500):
+    """Head and tail of long output, with the number of omitted lines in between"""
+    if len(text) <= max_chars:
+        return text
+    head, tail = text[: max_chars * 2 // 3], text[-max_chars // 3:]
+    omitted = text[len(head): len(text) - len(tail)].count("\n")
+    return f"{head}\n... [{omitted} lines omitted] ...\n{tail}"
+
+
+def _first_sentence(text, limit=120):
+    text = " ".join(text.split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    sentence = match.group(1) if match else text
+    return sentence if len(sentence) <= limit else sentence[: limit - 1] + "…"
+
+
+def summarize_message(message):
+    """One extractive line for an older turn"""
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    source = getattr(message, "source", None) or ("assistant" if isinstance(message, AssistantMessage) else "user")
+    code = _CODE_BLOCK.findall(content)
+    if code:
+        prose = _CODE_BLOCK.sub("", content).strip()
+        lines = sum(block.count("\n") + 1 for block in code)
+        return f"- {source}: {_first_sentence(prose) + ' ' if prose else ''}[sent {lines} lines of code]"
+    exceptions = [line.strip() for line in content.splitlines() if _EXCEPTION_LINE.match(line.strip())]
+    if exceptions:
+        return f"- {source}: run failed with {exceptions[-1][:160]}"
+    return f"- {source}: {_first_sentence(content)}"
+
+
+class SummarizingChatContext(ChatCompletionContext):
+    """Task + latest code verbatim, recent turns trimmed, older turns summarized, within max_tokens"""
+
+    def __init__(self, max_tokens=3000, keep_recent=4, keep_frames=2, max_output_chars=1500,
+                 token_counter=estimate_tokens, initial_messages=None):
+        """
+        Args:
+            max_tokens: Budget for the messages returned to the model
+            keep_recent: Number of latest messages kept (trimmed, not summarized)
+            keep_frames: Traceback frames kept per traceback
+            max_output_chars: Longest message text kept before cutting to head and tail
+            token_counter: Callable(text) -> int; chars/4 estimate by default
+            initial_messages: Messages to start with
+        """
+        super().__init__(initial_messages)
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.keep_frames = keep_frames
+        self.max_output_chars = max_output_chars
+        self.count = token_counter
+
+    def _trim(self, message):
+        if not isinstance(message.content, str):
+            return message
+        content = truncate_output(trim_traceback(message.content, self.keep_frames), self.max_output_chars)
+        return message if content == message.content else message.model_copy(update={"content": content})
+
+    def _tokens(self, message):
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        return self.count(content)
+
+    async def get_messages(self):
+        messages = list(self._messages)
+        if not messages:
+            return []
+
+        task_index = next((i for i, m in enumerate(messages) if isinstance(m, UserMessage)), None)
+        latest_code = next(
+            (i for i in range(len(messages) - 1, -1, -1)
+             if isinstance(messages[i], AssistantMessage) and isinstance(messages[i].content, str)
+             and _CODE_BLOCK.search(messages[i].content)),
+            None,
+        )
+        recent_start = max(len(messages) - self.keep_recent, 0)
+        pinned = {i for i in (task_index, latest_code) if i is not None}
+
+        kept = {}  # index -> message sent as-is (pinned) or trimmed (recent)
+        older = []
+        for i, message in enumerate(messages):
+            if i in pinned:
+                kept[i] = message
+            elif i >= recent_start:
+                kept[i] = self._trim(message)
+            else:
+                older.append(message)
+
+        summary_lines = [summarize_message(m) for m in older]
+
+        def total():
+            used = sum(self._tokens(m) for m in kept.values())
+            if summary_lines:
+                used += self.count("\n".join(summary_lines)) + 10
+            return used
+
+        # Over budget: drop summary lines (oldest first), then unpinned recent turns (oldest first)
+        while total() > self.max_tokens and summary_lines:
+            summary_lines.pop(0)
+        for i in sorted(kept):
+            if total() <= self.max_tokens:
+                break
+            if i not in pinned:
+                del kept[i]
+        # Still over (huge task/code): cut the pinned messages' text to fit
+        for i in sorted(kept, reverse=True):
+            over = total() - self.max_tokens
+            if over <= 0:
+                break
+            message = kept[i]
+            if isinstance(message.content, str):
+                chars = max(len(message.content) - over * CHARS_PER_TOKEN, 200)
+                kept[i] = message.model_copy(update={"content": truncate_output(message.content, chars)})
+
+        result = [kept[i] for i in sorted(kept)]
+        if summary_lines:
+            # Right after the task when it leads, otherwise first
+            at = 1 if task_index is not None and min(kept, default=None) == task_index else 0
+            result.insert(at, self._summary(summary_lines))
+
+        # Like BufferedChatCompletionContext: never start with a dangling tool result
+        while result and isinstance(result[0], FunctionExecutionResultMessage):
+            result.pop(0)
+        return result
+
+    @staticmethod
+    def _summary(lines):
+        return UserMessage(content="Summary of earlier attempts:\n" + "\n".join(lines), source="context_summary")
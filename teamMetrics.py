@@ -0,0 +1,238 @@
+"""
+Per-agent latency and token accounting for autogen_agentchat teams.
+
+    metrics = TeamMetrics(trace_path="trace.jsonl")
+    team = build_team(metrics=metrics)            # wraps each agent's model client / executor
+    await Console(metrics.trace(team.run_stream(task=task)))
+    metrics.report()
+
+Model calls record latency, time to first token (streaming calls only),
+and prompt/completion tokens. Executor calls record runtime and exit code.
+trace() passes the team stream through unchanged while timestamping each
+message, so whatever wall time is left over after model and executor time
+is orchestration and termination checks. report() prints a per-agent
+summary table and writes every event to the JSONL trace.
+"""
+
+import json
+import time
+from collections import defaultdict
+
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import BaseChatMessage, ModelClientStreamingChunkEvent
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeExecutor
+from autogen_core.models import ChatCompletionClient, CreateResult
+
+
+class InstrumentedModelClient(ChatCompletionClient):
+    """Model client wrapper that records one event per create/create_stream call"""
+
+    def __init__(self, client, agent, metrics, include_usage=True):
+        """
+        Args:
+            client: The real ChatCompletionClient (may be shared between agents)
+            agent: Agent name the calls are attributed to
+            metrics: TeamMetrics collecting the events
+            include_usage: Ask OpenAI-compatible servers for token usage on streamed calls
+        """
+        self.client = client
+        self.agent = agent
+        self.metrics = metrics
+        self.include_usage = include_usage
+
+    def _record(self, started, first_token, result):
+        usage = getattr(result, "usage", None)
+        self.metrics.add(
+            "model",
+            self.agent,
+            seconds=time.perf_counter() - started,
+            ttft=None if first_token is None else first_token - started,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            cached=getattr(result, "cached", False),
+        )
+
+    async def create(self, messages, **kwargs):
+        started = time.perf_counter()
+        result = await self.client.create(messages, **kwargs)
+        self._record(started, None, result)
+        return result
+
+    async def create_stream(self, messages, **kwargs):
+        if self.include_usage:
+            extra = dict(kwargs.get("extra_create_args") or {})
+            extra.setdefault("stream_options", {"include_usage": True})
+            kwargs["extra_create_args"] = extra
+        started = time.perf_counter()
+        first_token = None
+        async for chunk in self.client.create_stream(messages, **kwargs):
+            if isinstance(chunk, CreateResult):
+                self._record(started, first_token, chunk)
+            elif first_token is None:
+                first_token = time.perf_counter()
+            yield chunk
+
+    async def close(self):
+        await self.client.close()
+
+    def actual_usage(self):
+        return self.client.actual_usage()
+
+    def total_usage(self):
+        return self.client.total_usage()
+
+    def count_tokens(self, messages, **kwargs):
+        return self.client.count_tokens(messages, **kwargs)
+
+    def remaining_tokens(self, messages, **kwargs):
+        return self.client.remaining_tokens(messages, **kwargs)
+
+    @property
+    def capabilities(self):
+        return self.client.capabilities
+
+    @property
+    def model_info(self):
+        return self.client.model_info
+
+
+class TimedCodeExecutor(CodeExecutor):
+    """CodeExecutor wrapper that records runtime and exit code per execution"""
+
+    def __init__(self, executor, agent, metrics):
+        self.executor = executor
+        self.agent = agent
+        self.metrics = metrics
+
+    async def execute_code_blocks(self, code_blocks, cancellation_token: CancellationToken):
+        started = time.perf_counter()
+        result = await self.executor.execute_code_blocks(code_blocks, cancellation_token)
+        self.metrics.add(
+            "executor",
+            self.agent,
+            seconds=time.perf_counter() - started,
+            exit_code=result.exit_code,
+            blocks=len(code_blocks),
+        )
+        return result
+
+    async def start(self):
+        await self.executor.start()
+
+    async def stop(self):
+        await self.executor.stop()
+
+    async def restart(self):
+        await self.executor.restart()
+
+
+class TeamMetrics:
+    """Collects model/executor/message events for one team run"""
+
+    def __init__(self, trace_path="team_trace.jsonl"):
+        self.trace_path = trace_path
+        self.events = []
+        self.turn = 0
+        self.started = None
+        self.finished = None
+        self.stop_reason = None
+
+    def wrap_model_client(self, client, agent):
+        return InstrumentedModelClient(client, agent, self)
+
+    def wrap_executor(self, executor, agent):
+        return TimedCodeExecutor(executor, agent, self)
+
+    def add(self, kind, agent, **fields):
+        now = time.perf_counter()
+        self.events.append({
+            "kind": kind,
+            "agent": agent,
+            "turn": self.turn,
+            "t": round(now - (self.started or now), 4),
+            **fields,
+        })
+
+    async def trace(self, stream):
+        """Pass a team.run_stream() through, timestamping every message"""
+        self.started = time.perf_counter()
+        last_message_at = self.started
+        async for item in stream:
+            if isinstance(item, TaskResult):
+                # The gap since the last message is termination checks and teardown
+                self.stop_reason = item.stop_reason
+                self.add("finish", "team", seconds=time.perf_counter() - last_message_at,
+                         stop_reason=item.stop_reason)
+            elif not isinstance(item, ModelClientStreamingChunkEvent):
+                last_message_at = time.perf_counter()
+                self.add("message", item.source, type=item.type)
+                if isinstance(item, BaseChatMessage):
+                    # Model/executor events that follow belong to the next turn
+                    self.turn += 1
+            yield item
+        self.finished = time.perf_counter()
+
+    def totals(self):
+        """{agent: {model_calls, model_seconds, ttft, prompt_tokens, completion_tokens, exec_runs, exec_seconds}}"""
+        table = defaultdict(lambda: defaultdict(float))
+        ttfts = defaultdict(list)
+        for event in self.events:
+            row = table[event["agent"]]
+            if event["kind"] == "model":
+                row["model_calls"] += 1
+                row["model_seconds"] += event["seconds"]
+                row["prompt_tokens"] += event["prompt_tokens"]
+                row["completion_tokens"] += event["completion_tokens"]
+                if event["ttft"] is not None:
+                    ttfts[event["agent"]].append(event["ttft"])
+            elif event["kind"] == "executor":
+                row["exec_runs"] += 1
+                row["exec_seconds"] += event["seconds"]
+        for agent, values in ttfts.items():
+            table[agent]["ttft"] = sum(values) / len(values)
+        return {agent: dict(row) for agent, row in table.items() if row}
+
+    def wall_seconds(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary_table(self):
+        totals = self.totals()
+        lines = [
+            f"{'Agent':<14}{'Calls':>6}{'Model s':>9}{'TTFT s':>8}{'Prompt':>8}{'Compl.':>8}{'Runs':>6}{'Exec s':>8}",
+            "-" * 67,
+        ]
+        model_total = exec_total = 0.0
+        for agent, row in totals.items():
+            ttft = f"{row['ttft']:.2f}" if "ttft" in row else "-"
+            lines.append(
+                f"{agent:<14}{int(row.get('model_calls', 0)):>6}{row.get('model_seconds', 0):>9.2f}{ttft:>8}"
+                f"{int(row.get('prompt_tokens', 0)):>8}{int(row.get('completion_tokens', 0)):>8}"
+                f"{int(row.get('exec_runs', 0)):>6}{row.get('exec_seconds', 0):>8.2f}"
+            )
+            model_total += row.get("model_seconds", 0)
+            exec_total += row.get("exec_seconds", 0)
+        wall = self.wall_seconds()
+        lines.append("-" * 67)
+        lines.append(
+            f"Wall {wall:.2f}s = model {model_total:.2f}s + executor {exec_total:.2f}s"
+            f" + orchestration/termination {max(wall - model_total - exec_total, 0):.2f}s"
+            f" | {self.turn} turns, stop: {self.stop_reason}"
+        )
+        return "\n".join(lines)
+
+    def write_trace(self, path=None):
+        path = path or self.trace_path
+        with open(path, "w", encoding="utf-8") as f:
+            for event in self.events:
+                f.write(json.dumps(event, default=str) + "\n")
+        return path
+
+    def report(self):
+        """Print the summary table and write the JSONL trace"""
+        print("\n📊 Team metrics")
+        print(self.summary_table())
+        if self.trace_path:
+            print(f"📝 Trace written to {self.write_trace()}")
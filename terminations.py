@@ -0,0 +1,84 @@
+"""
+Termination conditions for the coder/executor teams.
+
+TextMentionTermination("FINISH") only fires after the assistant has seen a
+successful run and spent another model turn saying so (and never fires if
+the model forgets the keyword). ExecutionSuccessTermination stops the team
+as soon as the executor reports a successful run instead:
+
+    termination = ExecutionSuccessTermination(sources=["Executor"]) | TextMentionTermination("FINISH")
+
+A run counts as successful when its exit code is 0 and it printed
+something (and, if given, the output matches expected_output). Results
+are read from CodeExecutionEvent when the executor agent emits one, and
+otherwise from the executor's text reply, which CodeExecutorAgent words
+differently for failures and empty output.
+"""
+
+import re
+
+from autogen_agentchat.base import TerminatedException, TerminationCondition
+from autogen_agentchat.messages import CodeExecutionEvent, StopMessage, TextMessage
+
+# How CodeExecutorAgent rewrites the output of runs that did not succeed
+_FAILURE_PREFIXES = (
+    "The script ran, then exited with an error",
+    "The script ran but produced no output",
+    "No code blocks found",
+    "Code execution was not approved",
+)
+
+
+class ExecutionSuccessTermination(TerminationCondition):
+    """Terminate right after the first successful code execution"""
+
+    def __init__(self, sources=("Executor",), expected_output=None):
+        """
+        Args:
+            sources: Names of the code executor agents to watch
+            expected_output: Optional substring, compiled regex or callable(output) -> bool
+                the output must satisfy
+        """
+        self._sources = set(sources) if sources else None
+        self._expected = expected_output
+        self._terminated = False
+
+    @property
+    def terminated(self):
+        return self._terminated
+
+    def _matches_expected(self, output):
+        if self._expected is None:
+            return True
+        if callable(self._expected):
+            return bool(self._expected(output))
+        if isinstance(self._expected, re.Pattern):
+            return self._expected.search(output) is not None
+        return str(self._expected) in output
+
+    def _succeeded(self, exit_code, output):
+        output = output.strip()
+        if exit_code != 0 or not output or output.startswith(_FAILURE_PREFIXES):
+            return False
+        return self._matches_expected(output)
+
+    async def __call__(self, messages):
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        for message in messages:
+            if self._sources is not None and message.source not in self._sources:
+                continue
+            if isinstance(message, CodeExecutionEvent):
+                succeeded = self._succeeded(message.result.exit_code, message.result.output)
+            elif isinstance(message, TextMessage):
+                # No event (executor without a model client): the reply text is the run's output
+                succeeded = self._succeeded(0, message.content)
+            else:
+                continue
+            if succeeded:
+                self._terminated = True
+                return StopMessage(content="Code executed successfully", source="ExecutionSuccessTermination")
+        return None
+
+    async def reset(self):
+        self._terminated = False
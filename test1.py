@@ -1,95 +1,79 @@
-from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent
 from autogen_agentchat.ui import Console
-from autogen_agentchat.conditions import TextMentionTermination
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_ext.code_executors.docker import DockerCommandLineCodeExecutor
+from app1 import build_team as build_coding_team, get_code_executor, new_code_executor
+from batchRunner import load_items, run_batch
+from modelClients import check_ollama
+from teamMetrics import TeamMetrics
+from functools import partial
 from pathlib import Path
-import httpx
-
-# Ollama configuration
-OLLAMA_BASE_URL = 'http://localhost:11434'  # Change if Ollama is on a different machine
-
-# Test connection first
-print(f"Testing connection to {OLLAMA_BASE_URL}...")
-try:
-    import requests
-
-    response = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
-    models = [m['name'] for m in response.json()['models']]
-    print(f"✓ Connected! Available models: {models}")
-    if 'qwen2.5' not in ' '.join(models):
-        print("⚠ Warning: qwen2.5 not found. Run 'ollama pull qwen2.5' to install it.")
-except Exception as e:
-    print(f"✗ Connection failed: {e}")
-    print("Make sure Ollama is running: 'ollama serve'")
-    exit(1)
-
-# Define the model configuration for Ollama
-model_client = OpenAIChatCompletionClient(
-    model="qwen2.5",
-    api_key="ollama",
-    base_url=f"{OLLAMA_BASE_URL}/v1",
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-        "structured_output": False,
-    },
-    timeout=httpx.Timeout(300.0, connect=60.0),
-)
-
-# Setting up the code executor using Docker
-workdir = Path("coding")
-workdir.mkdir(exist_ok=True)
-
-try:
-    code_executor = DockerCommandLineCodeExecutor(work_dir=workdir)
-    print("✓ Docker executor initialized")
-except Exception as e:
-    print(f"✗ Docker failed: {e}")
-    print("Make sure Docker Desktop is running")
-    exit(1)
-
-# System message for the assistant
-system_message = """You are a helpful AI assistant who writes code and the user
-executes it. Solve tasks using your python coding skills.
-In the following cases, suggest python code (in a python coding block) for the
-user to execute. When using code, you must indicate the script type in the code block.
-You only need to create one working sample.
-Do not suggest incomplete code which requires users to modify it.
-Don't use a code block if it's not intended to be executed by the user. Don't
-include multiple code blocks in one response. Do not ask users to copy and
-paste the result. Instead, use 'print' function for the output when relevant.
-Check the execution result returned by the user.
-
-If the result indicates there is an error, fix the error.
-
-IMPORTANT: If it has executed successfully, ONLY output 'FINISH'."""
-
-# Create the AssistantAgent that writes code
-assistant_agent = AssistantAgent(
-    name="Assistant",
-    model_client=model_client,
-    system_message=system_message,
-)
-
-# Create the CodeExecutorAgent that executes code
-executor_agent = CodeExecutorAgent(
-    name="Executor",
-    code_executor=code_executor,
-)
-
-# Set up termination condition
-termination = TextMentionTermination("FINISH")
-
-# Create a team with round-robin communication
-team = RoundRobinGroupChat(
-    [assistant_agent, executor_agent],
-    termination_condition=termination,
-    max_turns=10,
-)
+import asyncio
+import re
+import shutil
+import tempfile
+import time
+
+# Ollama configuration: set OLLAMA_BASE_URL if Ollama is on a different machine.
+# Nothing connects on import; the health check and executor setup run from __main__.
+
+# Batch tasks each get a work dir under here, outside coding/ so they can't
+# see (or fingerprint) each other's files; removed after the task unless --keep-workdirs
+BATCH_WORKDIR = Path("coding_batch")
+
+
+def build_team(metrics=None, expected_output=None, code_executor=None):
+    """A fresh assistant/executor team (10 turns max) sharing the model client"""
+    return build_coding_team(max_turns=10, metrics=metrics, expected_output=expected_output,
+                             code_executor=code_executor)
+
+
+async def run_task(item, keep_workdirs=False):
+    """Run one task on its own team and work dir; never raises
+
+    Args:
+        item: Batch item with "id", "task" and "expected"
+        keep_workdirs: Leave the task's work dir behind (its path is in the record)
+    """
+    record = {"id": item["id"], "task": item["task"]}
+    if item.get("error"):
+        return dict(record, ok=False, error=item["error"], seconds=0.0)
+    started = time.perf_counter()
+    metrics = TeamMetrics(trace_path=None)
+    code_executor = work_dir = None
+    try:
+        BATCH_WORKDIR.mkdir(exist_ok=True)
+        prefix = "task_" + re.sub(r"[^\w.-]", "_", str(item["id"]))[:40] + "_"
+        work_dir = tempfile.mkdtemp(prefix=prefix, dir=BATCH_WORKDIR)
+        code_executor = new_code_executor(work_dir)
+        team = build_team(metrics, item["expected"], code_executor)
+        result = None
+        async for result in metrics.trace(team.run_stream(task=item["task"])):
+            pass
+        messages = result.messages
+        usage = [m.models_usage for m in messages if getattr(m, "models_usage", None)]
+        last = str(getattr(messages[-1], "content", "")) if messages else ""
+        record.update(
+            ok="FINISH" in last or "Code executed successfully" in (result.stop_reason or ""),
+            stop_reason=result.stop_reason,
+            turns=len(messages),
+            prompt_tokens=sum(u.prompt_tokens for u in usage),
+            completion_tokens=sum(u.completion_tokens for u in usage),
+            last_message=last,
+            agents=metrics.totals(),
+        )
+    except Exception as e:
+        record.update(ok=False, error=str(e))
+    finally:
+        if code_executor is not None:
+            try:
+                await code_executor.stop()
+            except Exception:
+                pass
+        if work_dir is not None:
+            if keep_workdirs:
+                record["work_dir"] = work_dir
+            else:
+                shutil.rmtree(work_dir, ignore_errors=True)
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
 
 
 # Run the conversation
@@ -102,14 +86,35 @@ async def main():
     print(f"{'=' * 60}\n")
 
     try:
-        # Run the team with the task
-        await Console(team.run_stream(task=task))
+        # Run the team with the task, timing every agent's model calls and code runs
+        metrics = TeamMetrics(trace_path="test1_trace.jsonl")
+        await Console(metrics.trace(build_team(metrics).run_stream(task=task)))
         print("\n✓ Task completed successfully!")
+        metrics.report()
     except Exception as e:
         print(f"\n✗ Error: {e}")
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(main())
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run coding tasks on the assistant/executor team")
+    parser.add_argument("--batch", help="File of tasks, one per line ('-' for stdin)")
+    parser.add_argument("--out", default="results.ndjson", help="NDJSON results file for --batch")
+    parser.add_argument("--concurrency", type=int, default=4, help="Teams running at once in --batch mode")
+    parser.add_argument("--keep-workdirs", action="store_true",
+                        help=f"Keep each --batch task's work dir under {BATCH_WORKDIR}/ for inspection")
+    args = parser.parse_args()
+
+    # Test connection first (a cached check over the shared sync pool; model clients use the async pool)
+    if not check_ollama("qwen2.5"):
+        exit(1)
+    if args.batch:
+        # Every task makes its own executor, so the shared coding/ one isn't needed
+        tasks = load_items(args.batch, "task", extra=("expected",))
+        worker = partial(run_task, keep_workdirs=args.keep_workdirs)
+        asyncio.run(run_batch(tasks, worker, args.out, args.concurrency, label="tasks"))
+    else:
+        # Setting up the code executor: Docker, or the warm local pool with CODE_EXECUTOR=local
+        get_code_executor()
+        asyncio.run(main())
@@ -1,102 +1,169 @@
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
 import ollama
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 import json
 
+from toolRegistry import ToolArgumentError, ToolRegistry
+
+agent_tools = ToolRegistry()
+
 
 class AdvancedOllamaAgent:
     def __init__(self, model="qwen2.5"):
         self.model = model
         self.driver = None
-        self.tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "navigate_browser",
-                    "description": "Navigate to a specific URL in the browser",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "url": {
-                                "type": "string",
-                                "description": "The URL to navigate to"
-                            }
-                        },
-                        "required": ["url"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_web",
-                    "description": "Search the web using Google",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query"
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                }
-            }
-        ]
-
-    def launch_browser(self):
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()
+        self.pool = None
+        self._browser_lock = threading.Lock()
+        self.steps = []
+        # Schemas are built once from the decorated methods below
+        self.tools = agent_tools.schemas
+
+    def launch_browser(self, pool=None):
+        if pool is not None:
+            self.pool = pool
+            self.driver = pool.acquire()
+        else:
+            self.driver = webdriver.Chrome()
+            self.driver.maximize_window()
         print("✅ Browser launched!")
 
-    def navigate_browser(self, url):
+    @agent_tools.tool(uses_browser=True)
+    def navigate_browser(self, url: str):
+        """Navigate to a specific URL in the browser
+
+        Args:
+            url: The URL to navigate to
+        """
         if not url.startswith('http'):
             url = 'https://' + url
         self.driver.get(url)
         return {"status": "success", "message": f"Navigated to {url}"}
 
-    def search_web(self, query):
+    @agent_tools.tool(uses_browser=True)
+    def search_web(self, query: str):
+        """Search the web using Google
+
+        Args:
+            query: Search query
+        """
         self.driver.get("https://www.google.com")
         search_box = self.driver.find_element(By.NAME, "q")
         search_box.send_keys(query)
         search_box.submit()
         return {"status": "success", "message": f"Searched for: {query}"}
 
-    def run_agent(self, task):
-        """Run the agent with function calling"""
-        messages = [{"role": "user", "content": task}]
-
-        response = ollama.chat(
-            model=self.model,
-            messages=messages,
-            tools=self.tools
-        )
-
-        # Check if the model wants to call a function
-        if response['message'].get('tool_calls'):
-            for tool_call in response['message']['tool_calls']:
+    def _call_tool(self, function_name, arguments, timeout=60):
+        """Execute one tool call, returning (result, seconds)
+
+        Browser tools share one WebDriver, which is not safe to drive from two
+        threads, so they take the browser lock; other tools run in parallel.
+        A browser call that timed out keeps running (and holding the lock) in
+        the background, so the lock wait is bounded by timeout and reported
+        as an error instead of blocking the next turn.
+        """
+        started = time.perf_counter()
+        tool = agent_tools.get(function_name)
+        if tool is None:
+            result = {"status": "error", "message": f"Unknown function: {function_name}"}
+            return result, time.perf_counter() - started
+        try:
+            if tool.uses_browser:
+                if not self._browser_lock.acquire(timeout=timeout):
+                    raise TimeoutError(f"Browser still busy with an earlier call after {timeout}s")
+                try:
+                    result = agent_tools.dispatch(function_name, arguments, instance=self)
+                finally:
+                    self._browser_lock.release()
+            else:
+                result = agent_tools.dispatch(function_name, arguments, instance=self)
+        except ToolArgumentError as e:
+            result = {"status": "error", "message": str(e)}
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        return result, time.perf_counter() - started
+
+    def _run_tool_calls(self, tool_calls, timeout):
+        """Run the tool calls from one response concurrently; results keep call order"""
+        pool = ThreadPoolExecutor(max_workers=len(tool_calls))
+        try:
+            futures = []
+            for tool_call in tool_calls:
                 function_name = tool_call['function']['name']
                 arguments = tool_call['function']['arguments']
 
                 print(f"🔧 Calling function: {function_name}")
                 print(f"📋 Arguments: {arguments}")
-
-                # Execute the function
-                if function_name == "navigate_browser":
-                    result = self.navigate_browser(arguments['url'])
-                elif function_name == "search_web":
-                    result = self.search_web(arguments['query'])
-
+                futures.append((function_name, pool.submit(self._call_tool, function_name, arguments, timeout)))
+
+            results = []
+            deadline = time.perf_counter() + timeout
+            for function_name, future in futures:
+                try:
+                    result, seconds = future.result(timeout=max(0, deadline - time.perf_counter()))
+                except FutureTimeout:
+                    result, seconds = {"status": "error", "message": f"Timed out after {timeout}s"}, timeout
                 print(f"✅ Result: {result}")
-        else:
-            print(f"🤖 Response: {response['message']['content']}")
+                results.append((function_name, result, seconds))
+            return results
+        finally:
+            # Don't wait on a timed-out call; its thread finishes in the background
+            pool.shutdown(wait=False)
+
+    def run_agent(self, task, max_steps=8, tool_timeout=60):
+        """Run the agent with function calling until the model answers without tools
+
+        Tool results are fed back as 'tool' messages. Timings for every step
+        are kept in self.steps.
+        """
+        messages = [{"role": "user", "content": task}]
+        self.steps = []
+
+        for step in range(1, max_steps + 1):
+            started = time.perf_counter()
+            response = ollama.chat(
+                model=self.model,
+                messages=messages,
+                tools=self.tools
+            )
+            timing = {"step": step, "llm_seconds": time.perf_counter() - started, "tools": []}
+            self.steps.append(timing)
+
+            message = response['message']
+            messages.append(message)
+
+            # Check if the model wants to call a function
+            if not message.get('tool_calls'):
+                print(f"🤖 Response: {message['content']}")
+                self._print_timings()
+                return message['content']
+
+            started = time.perf_counter()
+            for function_name, result, seconds in self._run_tool_calls(message['tool_calls'], tool_timeout):
+                messages.append({"role": "tool", "content": json.dumps(result), "tool_name": function_name})
+                timing["tools"].append({"name": function_name, "seconds": seconds})
+            timing["tool_seconds"] = time.perf_counter() - started
+
+        print(f"⚠ Step budget of {max_steps} exhausted before the model finished")
+        self._print_timings()
+        return None
+
+    def _print_timings(self):
+        for timing in self.steps:
+            tools = ", ".join(f"{t['name']} {t['seconds']:.2f}s" for t in timing["tools"])
+            print(f"⏱ Step {timing['step']}: model {timing['llm_seconds']:.2f}s"
+                  + (f", tools {timing['tool_seconds']:.2f}s ({tools})" if tools else ""))
 
     def close_browser(self):
         if self.driver:
-            self.driver.quit()
+            if self.pool is not None:
+                self.pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
 
 
 # Example usage
@@ -110,4 +177,7 @@ if __name__ == "__main__":
     agent.run_agent("Search for 'Python AI tutorials'")
     time.sleep(3)
 
+    # Multi-step tasks now run in one call
+    # agent.run_agent("Open python.org, then search the web for 'asyncio tutorial'")
+
     agent.close_browser()
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""
+Rough token accounting for prompt budgets, without a tokenizer.
+
+Shared by the page/DOM context builders, the summarizing chat context and
+the Ollama stub so every budget uses the same estimate.
+"""
+
+# Rough chars-per-token ratio for English text and markup
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
@@ -0,0 +1,248 @@
+"""
+Decorator-based tool registry shared by the browser and Jira agents.
+
+    tools = ToolRegistry()
+
+    @tools.tool(description="Navigate to a specific URL in the browser", uses_browser=True)
+    def navigate_browser(self, url: str):
+        ...
+
+Schemas are derived from the function signature (type hints + the "Args:"
+section of the docstring) once, at registration. The schema list and its
+JSON serialization are cached for reuse in every prompt, and dispatch is a
+single dict lookup followed by argument validation.
+"""
+
+import inspect
+import json
+import re
+import typing
+
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    dict: "object",
+    list: "array",
+}
+
+
+class ToolArgumentError(ValueError):
+    """Raised when a tool call's arguments don't match the tool's signature"""
+
+
+def _unwrap_optional(annotation):
+    """Optional[X] -> (X, True); anything else -> (annotation, False)"""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _json_schema(annotation):
+    annotation, _ = _unwrap_optional(annotation)
+    origin = typing.get_origin(annotation) or annotation
+    schema = {"type": _JSON_TYPES.get(origin, "string")}
+    if origin is list:
+        args = typing.get_args(annotation)
+        if args:
+            schema["items"] = _json_schema(args[0])
+    return schema
+
+
+def _arg_descriptions(docstring):
+    """Parse 'name: description' lines from a Google-style Args: section"""
+    descriptions = {}
+    in_args = False
+    for line in (docstring or "").splitlines():
+        stripped = line.strip()
+        if stripped in ("Args:", "Arguments:", "Parameters:"):
+            in_args = True
+            continue
+        if in_args:
+            if stripped and not line.startswith((" ", "\t")):
+                # Next unindented heading ends the Args: section
+                in_args = False
+                continue
+            match = re.match(r"(\w+)(?:\s*\([^)]*\))?:\s*(.+)", stripped)
+            if match:
+                descriptions[match.group(1)] = match.group(2)
+    return descriptions
+
+
+class Tool:
+    """A registered function plus its precomputed schema"""
+
+    __slots__ = ("name", "func", "description", "schema", "params", "required", "is_method", "uses_browser")
+
+    def __init__(self, func, name=None, description=None, uses_browser=False):
+        self.func = func
+        self.name = name or func.__name__
+        # Tools that drive the shared WebDriver must not run concurrently with each other
+        self.uses_browser = uses_browser
+        doc = inspect.getdoc(func) or ""
+        self.description = description or (doc.splitlines()[0] if doc else self.name)
+
+        signature = inspect.signature(func)
+        hints = typing.get_type_hints(func)
+        arg_docs = _arg_descriptions(doc)
+        parameters = list(signature.parameters.values())
+        self.is_method = bool(parameters) and parameters[0].name == "self"
+        if self.is_method:
+            parameters = parameters[1:]
+
+        properties, self.params, self.required = {}, {}, []
+        for param in parameters:
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            if param.name in hints:
+                annotation = hints[param.name]
+            elif param.default not in (inspect.Parameter.empty, None):
+                # Unannotated: infer from the default value
+                annotation = type(param.default)
+            else:
+                annotation = str
+            prop = _json_schema(annotation)
+            if param.name in arg_docs:
+                prop["description"] = arg_docs[param.name]
+            properties[param.name] = prop
+            self.params[param.name] = _unwrap_optional(annotation)[0]
+            if param.default is inspect.Parameter.empty:
+                self.required.append(param.name)
+
+        self.schema = {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": self.required,
+                },
+            },
+        }
+
+    def validate(self, arguments):
+        """Check names/required arguments and coerce scalar types (LLMs often send "5" for 5)"""
+        arguments = dict(arguments or {})
+        unknown = set(arguments) - set(self.params)
+        if unknown:
+            raise ToolArgumentError(f"{self.name}: unexpected argument(s) {sorted(unknown)}")
+        missing = [name for name in self.required if name not in arguments]
+        if missing:
+            raise ToolArgumentError(f"{self.name}: missing required argument(s) {missing}")
+
+        for name, value in arguments.items():
+            expected = typing.get_origin(self.params[name]) or self.params[name]
+            if value is None or not isinstance(expected, type) or isinstance(value, expected):
+                continue
+            try:
+                if expected is bool and isinstance(value, str):
+                    arguments[name] = value.strip().lower() in ("true", "1", "yes")
+                elif expected in (dict, list) and isinstance(value, str):
+                    arguments[name] = json.loads(value)
+                elif expected in (int, float, str):
+                    arguments[name] = expected(value)
+                else:
+                    raise TypeError
+            except (TypeError, ValueError):
+                raise ToolArgumentError(
+                    f"{self.name}: argument '{name}' should be {_JSON_TYPES.get(expected, expected.__name__)}"
+                ) from None
+        return arguments
+
+
+class ToolRegistry:
+    """Name -> Tool map with cached schemas and O(1) dispatch"""
+
+    def __init__(self):
+        self._tools = {}
+        self._schemas = None
+        self._schemas_json = None
+        self._description = None
+
+    def tool(self, name=None, description=None, uses_browser=False):
+        """Decorator registering a function or method as a tool"""
+        def decorator(func):
+            self.register(func, name=name, description=description, uses_browser=uses_browser)
+            return func
+        return decorator
+
+    def register(self, func, name=None, description=None, uses_browser=False):
+        tool = Tool(func, name=name, description=description, uses_browser=uses_browser)
+        self._tools[tool.name] = tool
+        self._schemas = self._schemas_json = self._description = None
+        return tool
+
+    def __contains__(self, name):
+        return name in self._tools
+
+    def get(self, name):
+        return self._tools.get(name)
+
+    def __iter__(self):
+        return iter(self._tools.values())
+
+    @property
+    def names(self):
+        return list(self._tools)
+
+    @property
+    def schemas(self):
+        """Ollama/OpenAI 'tools' list (built once)"""
+        if self._schemas is None:
+            self._schemas = [tool.schema for tool in self._tools.values()]
+        return self._schemas
+
+    @property
+    def schemas_json(self):
+        """Compact JSON of the schemas, serialized once for prompt reuse"""
+        if self._schemas_json is None:
+            self._schemas_json = json.dumps(self.schemas, separators=(",", ":"))
+        return self._schemas_json
+
+    def describe(self):
+        """One line per tool for plain-text prompts: '- name: description (args: a, b?)'"""
+        if self._description is None:
+            lines = []
+            for tool in self._tools.values():
+                args = ", ".join(name if name in tool.required else f"{name}?" for name in tool.params)
+                lines.append(f"- {tool.name}: {tool.description}" + (f" (args: {args})" if args else ""))
+            self._description = "\n".join(lines)
+        return self._description
+
+    def dispatch(self, name, arguments=None, instance=None):
+        """Validate arguments and call the tool; methods need the owning instance
+
+        Raises KeyError for unknown tools (check `name in registry` first, since
+        a KeyError from inside the tool looks the same) and ToolArgumentError
+        for bad arguments.
+        """
+        tool = self._tools[name]
+        arguments = tool.validate(arguments)
+        if tool.is_method:
+            return tool.func(instance, **arguments)
+        return tool.func(**arguments)
+
+    def function_map(self, instance=None):
+        """{name: callable} for autogen's function_map"""
+        return {
+            tool.name: tool.func.__get__(instance) if tool.is_method else tool.func
+            for tool in self._tools.values()
+        }
+
+    def register_autogen(self, caller, executor):
+        """Register every tool with a legacy autogen caller/executor agent pair"""
+        import autogen
+
+        for tool in self._tools.values():
+            autogen.register_function(
+                tool.func,
+                caller=caller,
+                executor=executor,
+                name=tool.name,
+                description=tool.description,
+            )
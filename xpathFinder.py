@@ -1,29 +1,81 @@
+import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import ollama
 from selenium import webdriver
-from selenium.webdriver.common.by import By
+
+from domDigest import DomDigest
+from locatorCache import LocatorStore
+from offlineXPath import OfflinePage
+from pageReady import install_tracker, wait_for_page_ready
+from xpathValidator import best_xpath, rank_candidates, validate_xpaths
 
 
 class SimpleXPathGenerator:
-    def __init__(self):
+    def __init__(self, max_workers=4, store_path="locators.json"):
         models = ollama.list()
         self.model = 'qwen2.5'
         self.driver = None
-
-    def start(self, url):
-        self.driver = webdriver.Chrome()
+        self.pool = None
+        # Set by load_snapshot/capture_snapshot; XPaths are then evaluated with lxml
+        self.page = None
+        self.digest = DomDigest()
+        self.store = LocatorStore(store_path) if store_path else None
+        # Upper bound on concurrent ollama.chat calls in generate_xpaths
+        self.max_workers = max_workers
+
+    def start(self, url, pool=None):
+        if pool is not None:
+            self.pool = pool
+            self.driver = pool.acquire()
+        else:
+            self.driver = webdriver.Chrome()
+        install_tracker(self.driver)
         self.driver.get(url)
-        time.sleep(2)
-
-    def generate_xpath(self, element_description):
-        """Generate XPath from description"""
-        # Get page title and URL for context
-        context = f"Page: {self.driver.title}\nURL: {self.driver.current_url}"
-
-        prompt = f"""{context}
+        wait_for_page_ready(self.driver, "navigate")
+
+    def load_snapshot(self, source, url=""):
+        """Work offline against a saved .html file or an HTML string"""
+        if os.path.exists(source):
+            self.page = OfflinePage.from_file(source, url)
+        else:
+            self.page = OfflinePage(source, url)
+        return self.page
+
+    def capture_snapshot(self, path=None):
+        """Grab page_source once and evaluate everything after this in-process"""
+        self.page = OfflinePage.from_driver(self.driver)
+        if path:
+            self.page.save(path)
+        return self.page
+
+    def _url(self):
+        return self.page.url if self.page is not None else self.driver.current_url
+
+    def _validate(self, xpaths):
+        if self.page is not None:
+            return self.page.evaluate(xpaths)
+        return validate_xpaths(self.driver, xpaths)
+
+    def _build_prompt(self, element_description):
+        """Build the XPath prompt for a single element description"""
+        # Get page title, URL and a compact element digest for context
+        if self.page is not None:
+            context = f"Page: {self.page.title}\nURL: {self.page.url}"
+            elements = self.page.digest(self.digest.max_tokens)
+        else:
+            context = f"Page: {self.driver.title}\nURL: {self.driver.current_url}"
+            elements = self.digest.get(self.driver)
+
+        return f"""{context}
+
+Elements on the page (tag#id attributes "text" .classes):
+{elements}
 
 Generate an XPath expression to find: {element_description}
+Only use ids, attributes and text that appear in the element list above.
 
 Provide 3 XPath options:
 1. Most specific (using ID/unique attributes)
@@ -32,33 +84,134 @@ Provide 3 XPath options:
 
 Format: Just list the 3 XPaths, one per line."""
 
+    def _ask_model(self, prompt):
+        """Ask the model for XPath candidates and parse them from the reply"""
         response = ollama.chat(
             model=self.model,
             messages=[{"role": "user", "content": prompt}]
         )
 
         xpaths = response['message']['content'].strip().split('\n')
-        xpaths = [x.strip() for x in xpaths if x.strip() and '//' in x]
+        # Drop list numbering ("1. ") and markdown backticks around each XPath
+        xpaths = [re.sub(r"^\s*(\d+[.)]\s*)?`*|`*\s*$", "", x) for x in xpaths]
+        xpaths = [x for x in xpaths if x and '//' in x]
+        return xpaths[:3]
 
+    def _print_results(self, element_description, results):
         print(f"\n🤖 Generated XPaths for '{element_description}':")
 
-        for i, xpath in enumerate(xpaths[:3], 1):
-            print(f"\n{i}. {xpath}")
-
-            try:
-                elements = self.driver.find_elements(By.XPATH, xpath)
-                if elements:
-                    print(f"   ✅ Found {len(elements)} element(s)")
-                else:
-                    print(f"   ❌ No elements found")
-            except:
-                print(f"   ❌ Invalid XPath")
-
-        return xpaths
+        for i, result in enumerate(results, 1):
+            print(f"\n{i}. {result['xpath']}")
+
+            if result["error"]:
+                print(f"   ❌ Invalid XPath ({result['error']})")
+            elif result["count"]:
+                flags = "unique" if result["unique"] else "not unique"
+                if not result["visible"]:
+                    flags += ", hidden"
+                print(f"   ✅ Found {result['count']} element(s) ({flags})")
+            else:
+                print(f"   ❌ No elements found")
+
+    def _from_cache(self, descriptions):
+        """Revalidate stored locators in one round trip
+
+        Returns {description: ranked results} for descriptions whose primary
+        or one of its fallbacks still matches exactly one element; the working
+        XPath comes first. Candidates that now match several elements no longer
+        identify the target, so those descriptions go back to the model.
+        """
+        if self.store is None:
+            return {}
+
+        url = self._url()
+        cached = {d: self.store.lookup(url, d) for d in descriptions}
+        all_xpaths = [x for xpaths in cached.values() for x in xpaths]
+        if not all_xpaths:
+            return {}
+        validated = {r["xpath"]: r for r in self._validate(all_xpaths)}
+
+        hits = {}
+        for description, xpaths in cached.items():
+            # Stored order is primary first, then fallbacks
+            working = [x for x in xpaths if validated[x]["count"] == 1 and not validated[x]["error"]]
+            if working:
+                hits[description] = [validated[x] for x in working]
+        if hits:
+            self.store.promote(url, {d: results[0]["xpath"] for d, results in hits.items()})
+        return hits
+
+    def _remember(self, description, results):
+        if self.store is not None:
+            self.store.record(self._url(), description, results)
+
+    def generate_xpath(self, element_description, use_cache=True):
+        """Generate XPath from description (candidates are returned best-first)"""
+        if use_cache:
+            hit = self._from_cache([element_description]).get(element_description)
+            if hit:
+                print(f"\n♻️ Cached XPath for '{element_description}': {hit[0]['xpath']}")
+                return [r["xpath"] for r in hit]
+
+        xpaths = self._ask_model(self._build_prompt(element_description))
+        results = rank_candidates(self._validate(xpaths))
+        self._print_results(element_description, results)
+        self._remember(element_description, results)
+        return [r["xpath"] for r in results]
+
+    def generate_xpaths(self, element_descriptions, use_cache=True):
+        """Generate XPaths for many descriptions and return a validated locator map
+
+        Stored locators are revalidated first; only the misses go to the
+        model. Model calls run concurrently (bounded by max_workers) and all
+        new candidates are validated in a single round trip.
+
+        Returns:
+            {description: {"xpath": best match or None, "candidates": [ranked validation results],
+                           "cached": bool}}
+        """
+        descriptions = list(dict.fromkeys(element_descriptions))
+        hits = self._from_cache(descriptions) if use_cache else {}
+        locator_map = {
+            d: {"xpath": results[0]["xpath"], "candidates": results, "cached": True}
+            for d, results in hits.items()
+        }
+        for description in locator_map:
+            print(f"\n♻️ Cached XPath for '{description}': {locator_map[description]['xpath']}")
+
+        misses = [d for d in descriptions if d not in hits]
+        if not misses:
+            return locator_map
+
+        # Prompts read from the driver, so build them before going concurrent
+        prompts = [self._build_prompt(d) for d in misses]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self._ask_model, prompts))
+
+        candidates = dict(zip(misses, results))
+        all_xpaths = [x for xpaths in results for x in xpaths]
+        validated = {r["xpath"]: r for r in self._validate(all_xpaths)}
+
+        for description, xpaths in candidates.items():
+            ranked = rank_candidates([validated[x] for x in dict.fromkeys(xpaths)])
+            locator_map[description] = {
+                "xpath": best_xpath(ranked),
+                "candidates": ranked,
+                "cached": False,
+            }
+            self._print_results(description, ranked)
+            self._remember(description, ranked)
+
+        return locator_map
 
     def close(self):
         if self.driver:
-            self.driver.quit()
+            if self.pool is not None:
+                self.pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
 
 
 # Quick test
@@ -71,5 +224,12 @@ if __name__ == "__main__":
     #gen.generate_xpath("navigation menu")
     #gen.generate_xpath("download link")
 
+    # Build a locator map for several elements in one go
+    #locators = gen.generate_xpaths(["search button", "navigation menu", "cart icon"])
+
+    # Capture the page once, then evaluate without further browser round trips
+    #gen.capture_snapshot("snapshots/amazon_home.html")
+    #locators = gen.generate_xpaths(["search button", "navigation menu", "cart icon"])
+
     time.sleep(3)
-    gen.close()
\ No newline at end of file
+    gen.close()
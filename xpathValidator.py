@@ -0,0 +1,100 @@
+"""
+Validate many XPath candidates in a single WebDriver round trip.
+
+All candidates are evaluated inside the page with document.evaluate, which
+reports match counts, visibility and syntax errors per candidate. The
+results are then ranked by how robust the locator is likely to be.
+"""
+
+import re
+
+VALIDATE_JS = """
+var xpaths = arguments[0];
+var isVisible = function (node) {
+  var el = node.nodeType === 1 ? node : node.parentElement;
+  if (!el) { return false; }
+  var r = el.getBoundingClientRect();
+  if (r.width === 0 && r.height === 0) { return false; }
+  var cs = window.getComputedStyle(el);
+  return cs.visibility !== 'hidden' && cs.display !== 'none';
+};
+return xpaths.map(function (xp) {
+  try {
+    var snap = document.evaluate(xp, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var visible = 0;
+    for (var i = 0; i < Math.min(snap.snapshotLength, 50); i++) {
+      if (isVisible(snap.snapshotItem(i))) { visible++; }
+    }
+    return {xpath: xp, count: snap.snapshotLength, visible: visible, error: null};
+  } catch (e) {
+    return {xpath: xp, count: 0, visible: 0, error: e.name + ': ' + e.message};
+  }
+});
+"""
+
+_STABLE_ATTR = re.compile(r"@(data-testid|data-test|name|aria-label|title|placeholder|for)\b")
+_ID_ATTR = re.compile(r"@id\s*=\s*['\"]([^'\"]+)['\"]")
+_GENERATED_ID = re.compile(r"\d{3,}|[0-9a-f]{8,}|[-_:]\d+$")
+_POSITION = re.compile(r"\[\s*\d+\s*\]|position\(\)|last\(\)")
+
+
+def robustness_score(result):
+    """Heuristic score: unique, visible, attribute-anchored locators win"""
+    if result["error"] or not result["count"]:
+        return float("-inf")
+
+    xpath = result["xpath"]
+    score = 0
+    if result["count"] == 1:
+        score += 50
+    else:
+        score -= min(result["count"], 20)
+    if result["visible"]:
+        score += 20
+
+    id_match = _ID_ATTR.search(xpath)
+    if id_match:
+        score += 5 if _GENERATED_ID.search(id_match.group(1)) else 15
+    if _STABLE_ATTR.search(xpath):
+        score += 12
+    if "text()" in xpath or "normalize-space(" in xpath:
+        score += 8
+    if "@class" in xpath:
+        score += 3
+
+    score -= 10 * len(_POSITION.findall(xpath))
+    if xpath.startswith("/html") or xpath.startswith("(/html"):
+        score -= 25
+    score -= 2 * xpath.count("/")
+    return score
+
+
+def validate_xpaths(driver, xpaths):
+    """Evaluate every candidate in one execute_script call
+
+    Returns a list of dicts with xpath, count, unique, visible (number of
+    visible matches among the first 50), error (None or the browser's
+    message) and score.
+    """
+    xpaths = list(dict.fromkeys(xpaths))
+    if not xpaths:
+        return []
+
+    results = driver.execute_script(VALIDATE_JS, xpaths)
+    for result in results:
+        result["unique"] = result["count"] == 1
+        result["score"] = robustness_score(result)
+    return results
+
+
+def rank_candidates(results):
+    """Sort validation results best-first; invalid/empty candidates go last"""
+    return sorted(results, key=lambda r: r["score"], reverse=True)
+
+
+def best_xpath(results):
+    """XPath of the top-ranked candidate that matched something, or None"""
+    for result in rank_candidates(results):
+        if result["count"] and not result["error"]:
+            return result["xpath"]
+    return None